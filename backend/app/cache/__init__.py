@@ -1,5 +1,6 @@
-"""In-memory caching utilities for extraction results."""
+"""Caching utilities for extraction results."""
 
 from .memory_cache import MemoryCache
+from .tiered_cache import TieredCache
 
-__all__ = ["MemoryCache"]
+__all__ = ["MemoryCache", "TieredCache"]
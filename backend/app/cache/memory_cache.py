@@ -2,35 +2,202 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Dict, Optional, Tuple
+import mmap
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import xxhash
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Below this size a single read() is cheaper than setting up a mapping
+_MMAP_MIN_SIZE = 64 * 1024
+_PICKLE_PROTOCOL = 5
+
+
+def hash_pdf_bytes(pdf_bytes: Any) -> str:
+    """Fingerprint PDF content with 128-bit xxh3; cache keys need speed, not crypto."""
+
+    return xxhash.xxh3_128_hexdigest(pdf_bytes)
+
+
+def hash_pdf_file(pdf_path: str) -> str:
+    """Hash a PDF from disk in one call, memory-mapping files larger than 64 KiB."""
+
+    with open(pdf_path, "rb") as pdf_file:
+        if os.fstat(pdf_file.fileno()).st_size < _MMAP_MIN_SIZE:
+            return hash_pdf_bytes(pdf_file.read())
+        with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hash_pdf_bytes(mapped)
+
+
+def schema_fingerprint(schema: Iterable[str]) -> str:
+    """Order-independent fingerprint of the requested field names."""
+
+    return "|".join(sorted(schema))
+
+
+def result_cache_key(label: str, pdf_hash: str, fingerprint: str) -> str:
+    """Key of a cached extraction result: document label, PDF hash and schema fingerprint."""
+
+    return f"{label}:{pdf_hash}:{fingerprint}"
+
+
+def _freeze(obj: Any) -> Any:
+    """Recursively convert ``obj`` into read-only containers.
+
+    Dicts become ``MappingProxyType`` views, lists/tuples become tuples and sets
+    become ``frozenset``; primitives are returned untouched.
+    """
+
+    if isinstance(obj, Mapping):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(_freeze(item) for item in obj)
+    return obj
+
+
+def _dump_payload(obj: Any) -> bytes:
+    return pickle.dumps(obj, protocol=_PICKLE_PROTOCOL)
+
+
+def _payload_size(obj: Any) -> int:
+    """Approximate the memory footprint of ``obj`` through its pickled size."""
+
+    try:
+        return sys.getsizeof(_dump_payload(obj))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return sys.getsizeof(obj)
+
+
+class _LRUStore:
+    """OrderedDict-backed LRU bounded by entry count and approximate bytes."""
+
+    __slots__ = ("max_entries", "max_bytes", "current_bytes", "hits", "misses", "evictions", "_entries")
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, size: int) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous[1]
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        # Always keep the newest entry, even if it alone exceeds the byte budget.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 
 class MemoryCache:
-    """Stores extraction payloads for quick reuse."""
+    """Stores extraction payloads for quick reuse.
+
+    Result payloads are stored as pickle protocol-5 blobs: the byte budget is
+    exact and every ``get_pdf_result`` returns a freshly loaded, private copy.
+    PDF content is large and read-mostly, so it is frozen once on
+    ``set_pdf_content`` and returned as-is; callers must treat it as read-only.
 
-    def __init__(self) -> None:
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._pdf_content_cache: Dict[str, Tuple[str, Any]] = {}
+    Both stores are LRUs bounded by ``max_entries`` and ``max_bytes``, so a
+    long-running server does not grow unbounded.
+    """
+
+    __slots__ = ("_cache", "_pdf_content_cache")
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self._cache = _LRUStore(max_entries, max_bytes)
+        self._pdf_content_cache = _LRUStore(max_entries, max_bytes)
 
     def get_pdf_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Return a cached extraction payload if available."""
+        """Return a private copy of a cached extraction payload if available."""
+
+        blob = self._cache.get(cache_key)
+        return pickle.loads(blob) if blob is not None else None
 
-        payload = self._cache.get(cache_key)
-        return deepcopy(payload) if payload is not None else None
+    async def get_pdf_result_async(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Awaitable ``get_pdf_result``; the memory tier never blocks."""
+
+        return self.get_pdf_result(cache_key)
 
     def set_pdf_result(self, cache_key: str, result_payload: Dict[str, Any]) -> None:
         """Store an extraction payload for future requests."""
 
-        self._cache[cache_key] = deepcopy(result_payload)
+        self._store_result_blob(cache_key, _dump_payload(result_payload))
+
+    def _store_result_blob(self, cache_key: str, blob: bytes) -> None:
+        self._cache.set(cache_key, blob, len(blob))
 
     def get_pdf_content(self, pdf_hash: str) -> Optional[Tuple[str, Any]]:
-        """Return cached PDF text and tables if available."""
+        """Return cached PDF text and read-only tables if available."""
+
+        return self._pdf_content_cache.get(pdf_hash)
 
-        content = self._pdf_content_cache.get(pdf_hash)
-        return deepcopy(content) if content is not None else None
+    async def get_pdf_content_async(self, pdf_hash: str) -> Optional[Tuple[str, Any]]:
+        """Awaitable ``get_pdf_content``; the memory tier never blocks."""
+
+        return self.get_pdf_content(pdf_hash)
 
     def set_pdf_content(self, pdf_hash: str, text: str, tables: Any) -> None:
         """Store PDF text and tables for future requests."""
 
-        self._pdf_content_cache[pdf_hash] = (text, deepcopy(tables))
+        self._store_pdf_content(pdf_hash, text, tables)
+
+    def _store_pdf_content(self, pdf_hash: str, text: str, tables: Any) -> Tuple[str, Any]:
+        content = (text, _freeze(tables))
+        size = sys.getsizeof(text) + _payload_size(tables)
+        self._pdf_content_cache.set(pdf_hash, content, size)
+        return content
+
+    def close(self) -> None:
+        """Release cache resources; the memory tier holds none."""
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss/eviction counters for each store."""
+
+        return {
+            "results": self._cache.stats(),
+            "pdf_content": self._pdf_content_cache.stats(),
+        }
@@ -0,0 +1,156 @@
+"""Two-tier cache: the in-memory LRU in front of a persistent diskcache store."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import diskcache
+
+from .memory_cache import _PICKLE_PROTOCOL, DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, MemoryCache, _dump_payload
+
+LOGGER = logging.getLogger(__name__)
+
+_RESULT_PREFIX = "result:"
+_CONTENT_PREFIX = "content:"
+
+
+class TieredCache(MemoryCache):
+    """``MemoryCache`` backed by an on-disk ``diskcache.Cache``.
+
+    Reads check RAM first and fall back to disk, promoting hits into the memory
+    tier. The ``*_async`` readers run that disk fallback in a worker thread;
+    the plain getters read disk inline and are meant for code off the event
+    loop. Writes land in RAM synchronously and are persisted to disk on a
+    single background thread, so the event loop never waits on SQLite. Disk
+    entries survive restarts and outlive memory-tier evictions.
+    """
+
+    __slots__ = ("_disk", "_writer", "_pending", "_disk_hits", "_disk_misses")
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        self._disk = diskcache.Cache(directory, disk_pickle_protocol=_PICKLE_PROTOCOL)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+        self._pending: List[Future] = []
+        # Memory-tier counters already count a disk fallback as a miss; these
+        # record how each fallback was resolved.
+        self._disk_hits = 0
+        self._disk_misses = 0
+
+    def get_pdf_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a payload from RAM, falling back to disk."""
+
+        payload = super().get_pdf_result(cache_key)
+        if payload is not None:
+            return payload
+        return self._promote_result(cache_key, self._disk_read(_RESULT_PREFIX + cache_key))
+
+    async def get_pdf_result_async(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Like ``get_pdf_result``, but the disk read runs in a worker thread."""
+
+        payload = super().get_pdf_result(cache_key)
+        if payload is not None:
+            return payload
+        blob = await asyncio.to_thread(self._disk_read, _RESULT_PREFIX + cache_key)
+        return self._promote_result(cache_key, blob)
+
+    def set_pdf_result(self, cache_key: str, result_payload: Dict[str, Any]) -> None:
+        """Store a payload in RAM and schedule the disk write."""
+
+        blob = _dump_payload(result_payload)
+        self._store_result_blob(cache_key, blob)
+        self._schedule_write(_RESULT_PREFIX + cache_key, blob)
+
+    def get_pdf_content(self, pdf_hash: str) -> Optional[Tuple[str, Any]]:
+        """Return cached PDF text and tables from RAM, falling back to disk."""
+
+        content = super().get_pdf_content(pdf_hash)
+        if content is not None:
+            return content
+        return self._promote_content(pdf_hash, self._disk_read(_CONTENT_PREFIX + pdf_hash))
+
+    async def get_pdf_content_async(self, pdf_hash: str) -> Optional[Tuple[str, Any]]:
+        """Like ``get_pdf_content``, but the disk read runs in a worker thread."""
+
+        content = super().get_pdf_content(pdf_hash)
+        if content is not None:
+            return content
+        blob = await asyncio.to_thread(self._disk_read, _CONTENT_PREFIX + pdf_hash)
+        return self._promote_content(pdf_hash, blob)
+
+    def set_pdf_content(self, pdf_hash: str, text: str, tables: Any) -> None:
+        """Store PDF text and tables in RAM and schedule the disk write."""
+
+        super().set_pdf_content(pdf_hash, text, tables)
+        # The caller may mutate ``tables`` after returning; pickle it now so
+        # the background write persists exactly what was cached in RAM.
+        self._schedule_write(_CONTENT_PREFIX + pdf_hash, _dump_payload((text, tables)))
+
+    def flush(self) -> None:
+        """Block until every scheduled disk write has completed."""
+
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Flush pending writes and release the disk store."""
+
+        self.flush()
+        self._writer.shutdown(wait=True)
+        self._disk.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return memory-tier counters plus the disk tier's entries, hits and misses."""
+
+        stats = super().stats()
+        stats["disk"] = {"entries": len(self._disk), "hits": self._disk_hits, "misses": self._disk_misses}
+        return stats
+
+    def _promote_result(self, cache_key: str, blob: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        if not self._count_disk_lookup(blob):
+            return None
+        # Both tiers hold the same pickled blob, so promotion is a plain store
+        self._store_result_blob(cache_key, blob)
+        return pickle.loads(blob)
+
+    def _promote_content(self, pdf_hash: str, blob: Optional[bytes]) -> Optional[Tuple[str, Any]]:
+        if not self._count_disk_lookup(blob):
+            return None
+        text, tables = pickle.loads(blob)
+        return self._store_pdf_content(pdf_hash, text, tables)
+
+    def _count_disk_lookup(self, blob: Optional[bytes]) -> bool:
+        # Counted by the caller, never in _disk_read, so worker threads don't race on them
+        if blob is None:
+            self._disk_misses += 1
+            return False
+        self._disk_hits += 1
+        return True
+
+    def _disk_read(self, key: str) -> Optional[bytes]:
+        try:
+            return self._disk.get(key)
+        except Exception:  # pragma: no cover - a corrupt disk entry is just a miss
+            LOGGER.warning("Disk cache read failed key=%s", key, exc_info=True)
+            return None
+
+    def _schedule_write(self, key: str, data: bytes) -> None:
+        # diskcache stores ``bytes`` as-is, so payloads are only pickled once
+        self._pending = [future for future in self._pending if not future.done()]
+        self._pending.append(self._writer.submit(self._write, key, data))
+
+    def _write(self, key: str, data: bytes) -> None:
+        try:
+            self._disk.set(key, data)
+        except Exception:  # pragma: no cover - persistence is best-effort
+            LOGGER.warning("Disk cache write failed key=%s", key, exc_info=True)
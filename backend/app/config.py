@@ -20,6 +20,33 @@ class Settings(BaseSettings):
         description="Truncate PDF text to this many characters before sending to the LLM.",
     )
     temperature: float = Field(default=1.0, ge=0.0, le=2.0)
+    cache_max_entries: int = Field(
+        default=256,
+        ge=1,
+        description="Maximum number of entries kept in each in-memory cache store.",
+    )
+    cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        description="Approximate memory budget (bytes) for each in-memory cache store.",
+    )
+    cache_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for the persistent disk cache tier; unset keeps caching in memory only.",
+    )
+    pdf_parallel_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Worker processes used to parse multi-page PDFs; 1 parses pages inline.",
+    )
+    use_pdfplumber_text: bool = Field(
+        default=False,
+        description="Extract PDF text with pdfplumber instead of the faster pypdfium2 backend.",
+    )
+    detailed_profiling: bool = Field(
+        default=False,
+        description="Also time per-field steps (e.g. validation) in the profiling metadata.",
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -2,8 +2,16 @@
 
 from .pdf_extractor import PDFExtractor
 from .llm_extractor import LLMExtractor
-from .heuristics import HeuristicExtractor
+from .heuristics import HeuristicContext, HeuristicExtractor
 from .validator import Validator
-from .error_recovery import extract_with_recovery
+from .error_recovery import extract_with_recovery, recover_fields
 
-__all__ = ["PDFExtractor", "LLMExtractor", "HeuristicExtractor", "Validator", "extract_with_recovery"]
+__all__ = [
+    "PDFExtractor",
+    "LLMExtractor",
+    "HeuristicContext",
+    "HeuristicExtractor",
+    "Validator",
+    "extract_with_recovery",
+    "recover_fields",
+]
@@ -4,10 +4,11 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
 from ..schema import SchemaLearner
-from .heuristics import HeuristicExtractor
+from .heuristics import HeuristicContext, HeuristicExtractor
 from .llm_extractor import LLMExtractor
 from .validator import Validator
 
@@ -25,81 +26,188 @@ async def extract_with_recovery(
     schema_learner: SchemaLearner,
     tables: Optional[list] = None,
     context_text: Optional[str] = None,
+    heuristic_context: Optional[HeuristicContext] = None,
 ) -> Tuple[Optional[Any], str, Dict[str, Any]]:
     """Attempt to recover a field value using progressively more expensive strategies.
 
+    ``heuristic_context`` lets callers share one scan of ``text`` across fields.
     Returns a tuple ``(value, source, metadata)`` where ``metadata`` contains any LLM statistics.
     """
 
     LOGGER.info("Recovery flow started for field '%s'", field)
+    if heuristic_context is None:
+        heuristic_context = HeuristicContext(text)
+
+    patterns = schema_learner.get_patterns(label)
+    local = _recover_locally(field, description, heuristic_context, patterns, heuristic_extractor, validator)
+    if local is not None:
+        return local[0], local[1], {}
+
+    # 3. Optimized LLM retry with expanded context (single call instead of two)
+    llm_result, llm_meta = await llm_extractor.extract_fields(
+        text=context_text or text,
+        label=label,
+        schema={field: _augmented_description(field, description, patterns)},
+        tables=tables,
+        validation_schema={field: description},
+    )
+
+    value = _llm_candidate(llm_result, field)
+    if value is not None:
+        return value, "llm_retry", llm_meta
+
+    LOGGER.info("Recovery failed for field '%s'", field)
+    return None, "not_found", {}
+
+
+async def recover_fields(
+    fields: Dict[str, str],
+    text: str,
+    label: str,
+    heuristic_extractor: HeuristicExtractor,
+    validator: Validator,
+    llm_extractor: LLMExtractor,
+    schema_learner: SchemaLearner,
+    tables: Optional[list] = None,
+    context_text: Optional[str] = None,
+    heuristic_context: Optional[HeuristicContext] = None,
+) -> Tuple[Dict[str, Tuple[Optional[Any], str]], Dict[str, Any]]:
+    """Recover several fields, sharing one LLM call for everything the cheap steps miss.
+
+    Runs the same strategies as ``extract_with_recovery`` per field, but the
+    fields still unresolved after the heuristic and template steps are sent to
+    the LLM together. Returns ``({field: (value, source)}, llm_metadata)``.
+
+    A failing LLM call only costs the fields that needed it: they come back as
+    ``(None, "not_found")`` next to the values recovered locally. The metadata
+    reports the usage of the LLM call whenever one was made, even if none of
+    its answers passed validation.
+    """
+
+    LOGGER.info("Batched recovery started for fields %s", list(fields))
+    if heuristic_context is None:
+        heuristic_context = HeuristicContext(text)
+
+    patterns = schema_learner.get_patterns(label)
+    results: Dict[str, Tuple[Optional[Any], str]] = {}
+    llm_schema: Dict[str, str] = {}
+    for field, description in fields.items():
+        local = _recover_locally(field, description, heuristic_context, patterns, heuristic_extractor, validator)
+        if local is not None:
+            results[field] = local
+        else:
+            llm_schema[field] = _augmented_description(field, description, patterns)
+
+    if not llm_schema:
+        return results, {}
+
+    try:
+        llm_result, llm_meta = await llm_extractor.extract_fields(
+            text=context_text or text,
+            label=label,
+            schema=llm_schema,
+            tables=tables,
+            validation_schema={field: fields[field] for field in llm_schema},
+        )
+    except Exception as exc:  # keep what the local steps recovered
+        LOGGER.error("Recovery LLM call failed for fields %s: %s", list(llm_schema), exc)
+        for field in llm_schema:
+            results[field] = (None, "not_found")
+        return results, {}
+
+    for field in llm_schema:
+        value = _llm_candidate(llm_result, field)
+        if value is not None:
+            results[field] = (value, "llm_retry")
+        else:
+            LOGGER.info("Recovery failed for field '%s'", field)
+            results[field] = (None, "not_found")
+    return results, llm_meta
+
+
+def _recover_locally(
+    field: str,
+    description: str,
+    heuristic_context: HeuristicContext,
+    label_patterns: Dict[str, Dict[str, Any]],
+    heuristic_extractor: HeuristicExtractor,
+    validator: Validator,
+) -> Optional[Tuple[Any, str]]:
+    """Run the strategies that need no LLM call; returns ``(value, source)`` on success."""
 
     # 1. Retry heuristics with relaxed matching
-    heuristic_value = _retry_heuristics(field, description, text, heuristic_extractor)
+    heuristic_value = _retry_heuristics(field, description, heuristic_context, heuristic_extractor)
     if heuristic_value is not None:
         is_valid, normalized = validator.validate_field(field, heuristic_value, description)
         if is_valid:
             LOGGER.info("Recovery success via heuristic retry for field '%s'", field)
-            return normalized, "heuristic_retry", {}
+            return normalized, "heuristic_retry"
 
     # 2. Template-based attempt using patterns learned previously
-    template_value = _match_with_template(field, text, schema_learner.get_patterns(label))
+    template_value = _match_with_template(field, heuristic_context.text, label_patterns)
     if template_value is not None:
         is_valid, normalized = validator.validate_field(field, template_value, description)
         if is_valid:
             LOGGER.info("Recovery success via template pattern for field '%s'", field)
-            return normalized, "template", {}
+            return normalized, "template"
 
-    # 3. Optimized LLM retry with expanded context (single call instead of two)
-    base_context = context_text or text
-    patterns = schema_learner.get_patterns(label)
-    example_value = patterns.get(field, {}).get("example")
+    return None
+
+
+def _augmented_description(field: str, description: str, label_patterns: Dict[str, Dict[str, Any]]) -> str:
+    """Build the best possible LLM description, including a previously seen example."""
 
-    # Build best possible description from the start
     augmented_description = description or f"Valor para o campo {field}"
+    example_value = label_patterns.get(field, {}).get("example")
     if example_value:
         augmented_description = f"{augmented_description} (exemplo anterior: {example_value})"
+    return augmented_description
 
-    llm_result, llm_meta = await llm_extractor.extract_fields(
-        text=base_context,
-        label=label,
-        schema={field: augmented_description},
-        tables=tables,
-    )
 
-    candidate = llm_result.get(field)
-    is_valid, normalized = validator.validate_field(field, candidate, description)
+def _llm_candidate(llm_result: Dict[str, Any], field: str) -> Optional[Any]:
+    """Return the normalized LLM value for ``field`` if the extractor accepted it.
+
+    The prompt carries the augmented description, but the extractor validated
+    against the field's own description (``validation_schema``).
+    """
+    _, normalized, is_valid = llm_result.get(field, (None, None, False))
     if is_valid and normalized not in (None, "", []):
         LOGGER.info("Recovery success via LLM retry for field '%s'", field)
-        return normalized, "llm_retry", llm_meta
-
-    LOGGER.info("Recovery failed for field '%s'", field)
-    return None, "not_found", {}
+        return normalized
+    return None
 
 
 def _retry_heuristics(
     field: str,
     description: str,
-    text: str,
+    context: HeuristicContext,
     heuristic_extractor: HeuristicExtractor,
 ) -> Optional[str]:
     """Run an additional, more permissive heuristic attempt."""
 
-    value = heuristic_extractor.extract_by_field_name(field, text)
+    value = heuristic_extractor.extract_by_field_name(field, context)
     if value:
         return value
 
-    value = heuristic_extractor.extract_by_description(description, text)
+    value = heuristic_extractor.extract_by_description(description, context)
     if value:
         return value
 
     # Relaxed search: look for enum matches even without explicit hints
-    candidates = re.findall(rf"{re.escape(field)}\s*[:\-]\s*([^\n]+)", text, flags=re.IGNORECASE)
+    candidates = _relaxed_field_re(field).findall(context.text)
     if candidates:
         return candidates[0].strip()
 
     return None
 
 
+@lru_cache(maxsize=512)
+def _relaxed_field_re(field: str) -> re.Pattern[str]:
+    """Compile the ``<field>: <value>`` pattern used by the relaxed retry once per field."""
+
+    return re.compile(rf"{re.escape(field)}\s*[:\-]\s*([^\n]+)", re.IGNORECASE)
+
+
 def _match_with_template(field: str, text: str, label_patterns: Dict[str, Dict[str, Any]]) -> Optional[str]:
     """Try to match previously seen examples with a generalized regex."""
 
@@ -111,40 +219,56 @@ def _match_with_template(field: str, text: str, label_patterns: Dict[str, Dict[s
     if not isinstance(example, str) or not example:
         return None
 
-    generalized = _generalize_example(example)
-    if not generalized:
+    compiled = _compile_example(example)
+    if compiled is None:
         return None
 
-    match = re.search(generalized, text, flags=re.IGNORECASE)
+    match = compiled.search(text)
     if match:
         return match.group().strip()
     return None
 
 
+@lru_cache(maxsize=1024)
+def _compile_example(example: str) -> Optional[re.Pattern[str]]:
+    """Compile the generalized regex for ``example`` once and reuse it."""
+
+    generalized = _generalize_example(example)
+    if not generalized:
+        return None
+    return re.compile(generalized, re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
 def _generalize_example(example: str) -> Optional[str]:
     """Convert a literal example into a regex pattern tolerant to digits/letters variance."""
 
     if not example:
         return None
 
-    pattern_parts = []
-    for char in example:
-        if char.isdigit():
-            pattern_parts.append(r"\d")
-        elif char.isalpha():
-            if char.isupper():
-                pattern_parts.append(r"[A-Z]")
-            elif char.islower():
-                pattern_parts.append(r"[a-z]")
-            else:
-                pattern_parts.append(r"[A-Za-z]")
-        else:
-            pattern_parts.append(re.escape(char))
+    if example.isascii():
+        # Single C-level pass: every ASCII char maps straight to its fragment
+        return example.translate(_ASCII_CHAR_CLASS)
+
+    return "".join(
+        _ASCII_CHAR_CLASS[ord(char)] if ord(char) < 128 else _classify_char(char) for char in example
+    )
 
-    if not pattern_parts:
-        return None
 
-    pattern = "".join(pattern_parts)
+def _classify_char(char: str) -> str:
+    if char.isdigit():
+        return r"\d"
+    if char.isalpha():
+        if char.isupper():
+            return r"[A-Z]"
+        if char.islower():
+            return r"[a-z]"
+        return r"[A-Za-z]"
     # Allow optional whitespace variations
-    pattern = pattern.replace(r"\ ", r"\s+")
-    return pattern
+    if char == " ":
+        return r"\s+"
+    return re.escape(char)
+
+
+# Regex fragment for each ASCII code point, indexed by ``ord(char)``
+_ASCII_CHAR_CLASS: Tuple[str, ...] = tuple(_classify_char(chr(code)) for code in range(128))
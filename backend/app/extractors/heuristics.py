@@ -2,27 +2,45 @@
 
 from __future__ import annotations
 
+import codecs
+import logging
 import re
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional, Tuple, Union
+
+try:  # Optional accelerator: one DFA pass finds which patterns occur at all
+    import hyperscan
+except ImportError:  # pragma: no cover - depends on the environment
+    hyperscan = None
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class HeuristicContext:
+    """Document text of one extraction run plus its pattern matches, scanned once.
+
+    Build it once per document and pass it to every heuristic call so all
+    fields (and recovery retries) reuse the same scan instead of re-reading
+    the text. The scan lives only as long as the context: nothing is kept at
+    module level once a request is done with it.
+    """
+
+    text: str
+    matches: Mapping[str, Tuple[str, ...]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.matches = _scan_text(self.text)
+
+
+TextOrContext = Union[str, HeuristicContext]
 
 
 class HeuristicExtractor:
     """Provides lightweight, regex-driven extraction strategies."""
 
-    # Pre-compiled regex patterns for performance (avoid recompilation)
-    _COMPILED_PATTERNS = {
-        "cpf": re.compile(r"\b\d{3}\.\d{3}\.\d{3}-\d{2}\b", re.IGNORECASE),
-        "cnpj": re.compile(r"\b\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}\b", re.IGNORECASE),
-        "email": re.compile(r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b", re.IGNORECASE),
-        "telefone": re.compile(r"\b(?:\+?55\s*)?\(?\d{2}\)?[\s-]*9?\d{4}[\s-]*\d{4}\b", re.IGNORECASE),
-        "data": re.compile(r"\b\d{1,2}/\d{1,2}/\d{4}\b", re.IGNORECASE),
-        "cep": re.compile(r"\b\d{5}-?\d{3}\b", re.IGNORECASE),
-        "placa": re.compile(r"\b[a-zA-Z]{3}-?\d{4}\b", re.IGNORECASE),
-        "valor": re.compile(r"R?\$\s*\d{1,3}(?:\.\d{3})*,\d{2}", re.IGNORECASE),
-        "numero_documento": re.compile(r"\b\d{6,12}\b", re.IGNORECASE),
-        "subsecao": re.compile(r"Conselho\s+Seccional\s*-\s*[^\n]+", re.IGNORECASE),
-    }
-
     PATTERNS = {
         "cpf": r"\b\d{3}\.\d{3}\.\d{3}-\d{2}\b",
         "cnpj": r"\b\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}\b",
@@ -57,51 +75,59 @@ class HeuristicExtractor:
     }
 
     ENUM_HINTS = ("pode ser", "opções", "options", "um dos", "one of")
+    _ENUM_HINT_RE = re.compile("|".join(re.escape(hint) for hint in ENUM_HINTS), re.IGNORECASE)
+
+    # Compiled once at class creation and shared by every extraction
+    _COMPILED_PATTERNS = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in PATTERNS.items()}
+
+    # Zero-width lookahead so overlapping keywords ("email"/"mail") are all reported
+    _KEYWORD_RE = re.compile(
+        "(?=(" + "|".join(sorted(map(re.escape, KEYWORD_TO_PATTERN), key=len, reverse=True)) + "))"
+    )
 
     @classmethod
-    def _run_pattern(cls, pattern: str, text: str) -> Optional[str]:
-        """Run pre-compiled pattern for better performance."""
-        compiled = cls._COMPILED_PATTERNS.get(pattern)
-        if compiled:
-            match = compiled.search(text)
-            if match:
-                return match.group().strip()
+    def scan_all(cls, text: str) -> Mapping[str, Tuple[str, ...]]:
+        """Return every match of every pattern in ``text``, keyed by pattern name.
+
+        Each call rescans ``text``; use a ``HeuristicContext`` to share one scan
+        across the fields of an extraction.
+        """
+
+        return _scan_text(text)
+
+    @staticmethod
+    def _as_context(source: TextOrContext) -> HeuristicContext:
+        if isinstance(source, HeuristicContext):
+            return source
+        return HeuristicContext(source)
+
+    @classmethod
+    def _first_match(cls, hint: str, context: HeuristicContext) -> Optional[str]:
+        for pattern_name in _patterns_for_hint(hint):
+            found = context.matches.get(pattern_name)
+            if found:
+                return found[0]
         return None
 
     @classmethod
-    def extract_by_field_name(cls, field: str, text: str) -> Optional[str]:
+    def extract_by_field_name(cls, field: str, ctx: TextOrContext) -> Optional[str]:
         """Attempt extraction using the field name as hint."""
 
-        field_normalized = field.lower()
-        for keyword, pattern_name in cls.KEYWORD_TO_PATTERN.items():
-            if keyword in field_normalized:
-                pattern = cls.PATTERNS.get(pattern_name)
-                if pattern:
-                    value = cls._run_pattern(pattern, text)
-                    if value:
-                        return value
-        return None
+        return cls._first_match(field.lower(), cls._as_context(ctx))
 
     @classmethod
-    def extract_by_description(cls, desc: str, text: str) -> Optional[str]:
+    def extract_by_description(cls, desc: str, ctx: TextOrContext) -> Optional[str]:
         """Attempt extraction using schema description hints."""
 
-        description = desc.lower()
-        for keyword, pattern_name in cls.KEYWORD_TO_PATTERN.items():
-            if keyword in description:
-                pattern = cls.PATTERNS.get(pattern_name)
-                if pattern:
-                    value = cls._run_pattern(pattern, text)
-                    if value:
-                        return value
-        return None
+        return cls._first_match(desc.lower(), cls._as_context(ctx))
 
     @classmethod
-    def extract_enum_values(cls, desc: str, text: str) -> Optional[str]:
+    def extract_enum_values(cls, desc: str, ctx: TextOrContext) -> Optional[str]:
         """If the description lists allowed values, try to find one in the PDF text."""
 
+        text = ctx.text if isinstance(ctx, HeuristicContext) else ctx
         description = desc.lower()
-        if not any(hint in description for hint in cls.ENUM_HINTS):
+        if not cls._ENUM_HINT_RE.search(description):
             return None
 
         options = cls._parse_enum_options(description)
@@ -115,24 +141,138 @@ class HeuristicExtractor:
         return None
 
     @staticmethod
-    def _parse_enum_options(description: str) -> list[str]:
-        """Return a list of enum-like options hinted in the description."""
+    def _parse_enum_options(description: str) -> Tuple[str, ...]:
+        """Return the enum-like options hinted in the description (memoized)."""
+
+        return _parse_enum_options(description)
+
+
+_ENUM_OPTIONS_RE = re.compile(r"(?:pode ser|opções|options|um dos|one of)\s*[:\-]?\s*(.+)")
+_ENUM_SPLIT_RE = re.compile(r"[,/]| ou | or ")
+
+
+@lru_cache(maxsize=512)
+def _parse_enum_options(description: str) -> Tuple[str, ...]:
+    """Return a tuple of enum-like options hinted in the description."""
+
+    # Look for structures like "pode ser A, B ou C"
+    enum_match = _ENUM_OPTIONS_RE.search(description)
+    if not enum_match:
+        return ()
 
-        # Look for structures like "pode ser A, B ou C"
-        enum_match = re.search(
-            r"(?:pode ser|opções|options|um dos|one of)\s*[:\-]?\s*(.+)",
-            description,
+    enum_text = enum_match.group(1)
+
+    # Split on common delimiters while removing filler words
+    raw_options = _ENUM_SPLIT_RE.split(enum_text)
+    cleaned = []
+    for option in raw_options:
+        token = option.strip(" .:-").lower()
+        if token and token not in {"", "etc"}:
+            cleaned.append(token)
+    return tuple(cleaned)
+
+
+@lru_cache(maxsize=1024)
+def _patterns_for_hint(hint: str) -> Tuple[str, ...]:
+    """Return pattern names whose keywords occur in ``hint``, in ``KEYWORD_TO_PATTERN`` order."""
+
+    found = {match.group(1) for match in HeuristicExtractor._KEYWORD_RE.finditer(hint)}
+    if not found:
+        return ()
+    ordered = (
+        pattern_name
+        for keyword, pattern_name in HeuristicExtractor.KEYWORD_TO_PATTERN.items()
+        if keyword in found
+    )
+    return tuple(dict.fromkeys(ordered))
+
+
+def _scan_text(text: str) -> Mapping[str, Tuple[str, ...]]:
+    """Run each heuristic pattern once over ``text`` and collect all matches.
+
+    Patterns are scanned individually rather than through one combined
+    alternation: a combined regex would let earlier patterns shadow later ones
+    (e.g. ``cep``/``telefone`` consuming digits ``numero_documento`` needs).
+    When Hyperscan is available it first tells us which patterns occur at all,
+    so ``re`` only runs for those.
+    """
+
+    candidates = _hyperscan_candidates(text)
+    return MappingProxyType(
+        {
+            name: (
+                tuple(match.group().strip() for match in compiled.finditer(text))
+                if candidates is None or name in candidates
+                else ()
+            )
+            for name, compiled in HeuristicExtractor._COMPILED_PATTERNS.items()
+        }
+    )
+
+
+def _ascii_placeholder(char: str) -> str:
+    """Map a non-ASCII char to an ASCII char of the same ``re`` character class."""
+
+    for variant in (char.lower(), char.upper()):
+        if len(variant) == 1 and variant.isascii() and variant.isalpha():
+            return variant  # keeps IGNORECASE folds such as KELVIN SIGN -> k
+    if char.isdecimal():
+        return "0"
+    if char.isalnum():
+        return "a"
+    if char.isspace():
+        return " "
+    return "#"
+
+
+def _ascii_fold_errors(error: UnicodeError) -> Tuple[str, int]:
+    if not isinstance(error, UnicodeEncodeError):
+        raise error
+    chunk = error.object[error.start : error.end]
+    return "".join(_ascii_placeholder(char) for char in chunk), error.end
+
+
+codecs.register_error("heuristics.ascii_fold", _ascii_fold_errors)
+
+
+def _build_hyperscan_db():
+    if hyperscan is None:
+        return None
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    patterns = HeuristicExtractor.PATTERNS
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for pattern in patterns.values()],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns),
         )
-        if not enum_match:
-            return []
-
-        enum_text = enum_match.group(1)
-
-        # Split on common delimiters while removing filler words
-        raw_options = re.split(r"[,/]| ou | or ", enum_text)
-        cleaned = []
-        for option in raw_options:
-            token = option.strip(" .:-").lower()
-            if token and token not in {"", "etc"}:
-                cleaned.append(token)
-        return cleaned
+    except hyperscan.error as exc:
+        LOGGER.warning("Hyperscan database unavailable, using re only: %s", exc)
+        return None
+    return database
+
+
+_HYPERSCAN_DB = _build_hyperscan_db()
+_PATTERN_NAMES = tuple(HeuristicExtractor.PATTERNS)
+
+
+def _hyperscan_candidates(text: str) -> Optional[FrozenSet[str]]:
+    """Return names of patterns present in ``text``, or ``None`` without Hyperscan.
+
+    Hyperscan matches ASCII classes only, so non-ASCII characters are replaced
+    with ASCII stand-ins of the same ``re`` class first. The result may contain
+    false positives (``re`` then finds nothing) but never misses a pattern.
+    """
+
+    if _HYPERSCAN_DB is None:
+        return None
+
+    hits = set()
+
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: object) -> None:
+        hits.add(_PATTERN_NAMES[pattern_id])
+
+    _HYPERSCAN_DB.scan(text.encode("ascii", "heuristics.ascii_fold"), match_event_handler=on_match)
+    return frozenset(hits)
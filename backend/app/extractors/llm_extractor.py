@@ -10,15 +10,41 @@ from typing import Any, Dict, Optional, Tuple
 from openai import AsyncOpenAI
 
 from ..config import get_openai_api_key, get_settings
+from .validator import Validator
 
 LOGGER = logging.getLogger(__name__)
 
+# ``(raw value, normalized value, is_valid)`` for each schema field
+FieldOutcome = Tuple[Any, Any, bool]
+
+# Optimized prompt to reduce tokens while maintaining quality
+_SYSTEM_PROMPT = (
+    "Extract structured data from PDF text. Return only valid JSON mapping field names to values.\n"
+    "Use null for missing values."
+)
+
+# Bound from Settings on first use so the hot path reads plain module globals
+_MAX_CHARS: Optional[int] = None
+_MODEL: Optional[str] = None
+_TEMPERATURE: Optional[float] = None
+
+
+def _load_settings() -> None:
+    global _MAX_CHARS, _MODEL, _TEMPERATURE
+    settings = get_settings()
+    _MAX_CHARS = settings.extraction_max_chars
+    _MODEL = settings.openai_model
+    _TEMPERATURE = settings.temperature
+
 
 class LLMExtractor:
     """Calls OpenAI models to extract structured data from text."""
 
     _client: Optional[AsyncOpenAI] = None
 
+    def __init__(self, validator: Optional[Validator] = None) -> None:
+        self.validator = validator or Validator()
+
     @classmethod
     def _get_client(cls) -> AsyncOpenAI:
         if cls._client is None:
@@ -26,53 +52,54 @@ class LLMExtractor:
             cls._client = AsyncOpenAI(api_key=api_key)
         return cls._client
 
-    @staticmethod
     async def extract_fields(
+        self,
         text: str,
         label: str,
         schema: Dict[str, str],
         tables: Optional[list] = None,
-    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-        """Extract every field defined in ``schema`` using a single LLM call."""
-
-        settings = get_settings()
-        truncated_text = text[: settings.extraction_max_chars]
+        validation_schema: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Dict[str, FieldOutcome], Dict[str, Any]]:
+        """Extract every field defined in ``schema`` using a single LLM call.
+
+        Each field maps to ``(raw, normalized, is_valid)``: the raw value is
+        validated by ``self.validator`` while the response is parsed, so
+        callers do not need a second validation pass. Values are validated
+        against ``validation_schema`` when given (e.g. the original
+        descriptions behind an augmented prompt), otherwise against ``schema``.
+        """
+
+        if _MODEL is None:
+            _load_settings()
+        model = _MODEL
+        truncated_text = text[:_MAX_CHARS]
         LOGGER.info("Calling LLM for label '%s' with %s chars", label, len(truncated_text))
 
-        schema_json = json.dumps(schema, ensure_ascii=False, indent=2)
-        tables_json = json.dumps(tables or [], ensure_ascii=False, indent=2)
-
-        # Optimized prompt to reduce tokens while maintaining quality
-        prompt = (
-            "Extract structured data from PDF text. Return only valid JSON mapping field names to values.\n"
-            "Use null for missing values."
-        )
-
-        user_content = (
-            f"Label: {label}\n"
-            f"Fields:\n{schema_json}\n"
-            f"Text:\n{truncated_text}\n"
+        # Compact separators keep json on its C encoder and send fewer prompt tokens
+        schema_json = json.dumps(schema, ensure_ascii=False, separators=(",", ":"))
+        tables_section = (
+            f"\nExtracted tables (rows):\n{json.dumps(tables, ensure_ascii=False, separators=(',', ':'))}\n"
+            if tables
+            else ""
         )
-
-        if tables_json != "[]":
-            user_content += f"\nExtracted tables (rows):\n{tables_json}\n"
+        user_content = f"Label: {label}\nFields:\n{schema_json}\nText:\n{truncated_text}\n{tables_section}"
 
         client = LLMExtractor._get_client()
         started = time.perf_counter()
 
         # Prepare request parameters
         params: Dict[str, Any] = {
-            "model": settings.openai_model,
+            "model": model,
             "response_format": {"type": "json_object"},
             "messages": [
-                {"role": "system", "content": prompt},
+                {"role": "system", "content": _SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
         }
 
         # Only add temperature if not default (1.0) to avoid issues with some models
-        if settings.temperature != 1.0:
-            params["temperature"] = settings.temperature
+        if _TEMPERATURE != 1.0:
+            params["temperature"] = _TEMPERATURE
 
         response = await client.chat.completions.create(**params)
         duration_ms = int((time.perf_counter() - started) * 1000)
@@ -81,12 +108,21 @@ class LLMExtractor:
 
         raw_content = response.choices[0].message.content or "{}"
         extracted = json.loads(raw_content)
+        outcomes: Dict[str, FieldOutcome] = {field: (None, None, False) for field in schema}
+        # Fields the model left out (or returned as null) skip validation entirely
+        present = [(field, extracted[field]) for field in schema if extracted.get(field) is not None]
+        descriptions = validation_schema or schema
+        validations = self.validator.validate_many(
+            [(field, raw, descriptions.get(field) or "") for field, raw in present]
+        )
+        for (field, raw), (is_valid, normalized) in zip(present, validations):
+            outcomes[field] = (raw, normalized, is_valid)
 
         usage = response.usage.model_dump() if response.usage else {}
         metadata = {
-            "model": settings.openai_model,
+            "model": model,
             "duration_ms": duration_ms,
             **usage,
         }
 
-        return extracted, metadata
+        return outcomes, metadata
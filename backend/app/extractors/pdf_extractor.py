@@ -1,43 +1,178 @@
-"""PDF extraction utilities built on pdfplumber."""
+"""PDF extraction utilities built on pypdfium2 (text) and pdfplumber (tables)."""
 
 from __future__ import annotations
 
+import io
 import logging
-from typing import List, Sequence
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import pdfplumber
+import pypdfium2 as pdfium
 
 LOGGER = logging.getLogger(__name__)
 
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = Lock()
+# PDFium is not thread-safe; serialize every call into it
+_PDFIUM_LOCK = Lock()
+
+# A filesystem path or the raw PDF bytes already held in memory
+PDFSource = Union[str, bytes]
+
 
 class PDFExtractor:
-    """Thin wrapper around pdfplumber for text and table extraction."""
+    """Thin wrapper around PDF libraries for text and table extraction.
+
+    Text comes from pypdfium2 (C++ PDFium), which is much faster than
+    pdfplumber's pure-Python pdfminer backend; pdfplumber is kept for tables,
+    where its layout analysis matters. Pass ``use_pdfplumber_text=True`` to
+    extract text with pdfplumber as well.
+
+    Every method takes a ``PDFSource``: a file path, or the PDF bytes so an
+    upload can be parsed without a temporary file.
+    """
 
     @staticmethod
-    def extract_text(pdf_path: str) -> str:
+    def extract_all(source: PDFSource, use_pdfplumber_text: bool = False) -> Tuple[str, List[Sequence[str]]]:
+        """Return ``(text, table_rows)``; pdfplumber parses each page only once."""
+
+        if use_pdfplumber_text:
+            return PDFExtractor._extract(source, include_text=True, include_tables=True)
+        _, table_rows = PDFExtractor._extract(source, include_text=False, include_tables=True)
+        return PDFExtractor.extract_text_fast(source), table_rows
+
+    @staticmethod
+    def extract_all_parallel(
+        source: PDFSource,
+        workers: Optional[int] = None,
+        use_pdfplumber_text: bool = False,
+    ) -> Tuple[str, List[Sequence[str]]]:
+        """Like ``extract_all`` but parses pages concurrently in worker processes.
+
+        pdfplumber is pure Python and holds the GIL, so pages are dispatched to a
+        process pool; each worker re-opens the file because pdfplumber objects
+        cannot be pickled. Single-page documents, and in-memory sources (which
+        would be pickled once per page), are parsed inline.
+        """
+
+        workers = workers or os.cpu_count() or 1
+        if isinstance(source, bytes):
+            return PDFExtractor.extract_all(source, use_pdfplumber_text=use_pdfplumber_text)
+        with pdfplumber.open(source) as pdf:
+            page_count = len(pdf.pages)
+        if workers < 2 or page_count < 2:
+            return PDFExtractor.extract_all(source, use_pdfplumber_text=use_pdfplumber_text)
+
+        pool = _get_pool(workers)
+        pages = pool.map(
+            _extract_page,
+            [source] * page_count,
+            range(page_count),
+            [use_pdfplumber_text] * page_count,
+        )
+        pages_text: List[str] = []
+        table_rows: List[Sequence[str]] = []
+        for content, rows in pages:
+            pages_text.append(content)
+            table_rows.extend(rows)
+        if not use_pdfplumber_text:
+            return PDFExtractor.extract_text_fast(source), table_rows
+        return "\n\n".join(pages_text).strip(), table_rows
+
+    @staticmethod
+    def extract_text(source: PDFSource, use_pdfplumber: bool = False) -> str:
         """Return concatenated text from every page of the PDF."""
 
-        LOGGER.debug("Extracting text from PDF: %s", pdf_path)
-        with pdfplumber.open(pdf_path) as pdf:
-            pages_text = []
-            for index, page in enumerate(pdf.pages):
-                content = page.extract_text() or ""
-                LOGGER.debug("Page %s text length: %s", index, len(content))
-                pages_text.append(content)
+        if not use_pdfplumber:
+            return PDFExtractor.extract_text_fast(source)
+        text, _ = PDFExtractor._extract(source, include_text=True, include_tables=False)
+        return text
+
+    @staticmethod
+    def extract_text_fast(source: PDFSource) -> str:
+        """Return concatenated page text using PDFium."""
+
+        LOGGER.debug("Extracting text with pypdfium2: %s", _describe(source))
+        pages_text = []
+        with _PDFIUM_LOCK:
+            # PdfDocument reads a path or ``bytes`` directly
+            pdf = pdfium.PdfDocument(source)
+            try:
+                for index, page in enumerate(pdf):
+                    textpage = page.get_textpage()
+                    # PDFium emits CRLF line breaks; heuristics expect "\n"
+                    content = textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+                    textpage.close()
+                    page.close()
+                    LOGGER.debug("Page %s text length: %s", index, len(content))
+                    pages_text.append(content)
+            finally:
+                pdf.close()
         return "\n\n".join(pages_text).strip()
 
     @staticmethod
-    def extract_tables(pdf_path: str) -> List[Sequence[str]]:
+    def extract_tables(source: PDFSource) -> List[Sequence[str]]:
         """Extract table rows from the PDF when available."""
 
-        LOGGER.debug("Extracting tables from PDF: %s", pdf_path)
+        _, table_rows = PDFExtractor._extract(source, include_text=False, include_tables=True)
+        return table_rows
+
+    @staticmethod
+    def _extract(
+        source: PDFSource,
+        include_text: bool,
+        include_tables: bool,
+    ) -> Tuple[str, List[Sequence[str]]]:
+        LOGGER.debug("Extracting from PDF: %s (text=%s tables=%s)", _describe(source), include_text, include_tables)
+        pages_text: List[str] = []
         table_rows: List[Sequence[str]] = []
-        with pdfplumber.open(pdf_path) as pdf:
+        # pdfplumber takes a path or a binary stream, not raw bytes
+        with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source) as pdf:
             for index, page in enumerate(pdf.pages):
-                tables = page.extract_tables() or []
-                LOGGER.debug("Page %s yielded %s tables", index, len(tables))
-                for table in tables:
-                    for row in table:
-                        if row:
-                            table_rows.append(tuple(cell or "" for cell in row))
-        return table_rows
+                if include_text:
+                    content = page.extract_text() or ""
+                    LOGGER.debug("Page %s text length: %s", index, len(content))
+                    pages_text.append(content)
+                if include_tables:
+                    tables = page.extract_tables() or []
+                    LOGGER.debug("Page %s yielded %s tables", index, len(tables))
+                    for table in tables:
+                        for row in table:
+                            if row:
+                                table_rows.append(tuple(cell or "" for cell in row))
+        return "\n\n".join(pages_text).strip(), table_rows
+
+
+def _extract_page(pdf_path: str, page_index: int, include_text: bool) -> Tuple[str, List[Sequence[str]]]:
+    """Parse a single page with pdfplumber; runs inside a worker process."""
+
+    with pdfplumber.open(pdf_path, pages=[page_index + 1]) as pdf:
+        page = pdf.pages[0]
+        content = (page.extract_text() or "") if include_text else ""
+        rows = [
+            tuple(cell or "" for cell in row)
+            for table in page.extract_tables() or []
+            for row in table
+            if row
+        ]
+    return content, rows
+
+
+def _describe(source: PDFSource) -> str:
+    return f"<{len(source)} bytes in memory>" if isinstance(source, bytes) else source
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool reused across calls (spawned processes are costly)."""
+
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            # "spawn" avoids forking the threaded server process
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _POOLS[workers] = pool
+        return pool
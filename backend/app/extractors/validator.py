@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import re
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 
 class Validator:
@@ -13,9 +15,13 @@ class Validator:
     CPF_REGEX = re.compile(r"^\d{3}\.\d{3}\.\d{3}-\d{2}$")
     CPF_DIGITS_REGEX = re.compile(r"^\d{11}$")
     DIGITS_ONLY_REGEX = re.compile(r"\D")  # Pre-compile for CPF normalization
+    NON_DIGIT_KEEP_NEWLINE_REGEX = re.compile(r"[^\d\n]")  # Batch CPF normalization
     EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
     PHONE_REGEX = re.compile(r"^(?:\+?55)?\s*\(?\d{2}\)?\s*9?\d{4}-?\d{4}$")
     DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d")
+    # Field-kind keywords, matched against field names and descriptions in one pass
+    PHONE_FIELD_REGEX = re.compile(r"telefone|celular|phone")
+    DATE_FIELD_REGEX = re.compile(r"data|nascimento|emissao")
 
     @staticmethod
     def validate_cpf(value: str) -> bool:
@@ -49,15 +55,13 @@ class Validator:
         return False
 
     @staticmethod
-    def validate_enum(value: str, allowed: list[str]) -> bool:
+    def validate_enum(value: str, allowed: Sequence[str]) -> bool:
         lowered = value.strip().lower()
-        return lowered in {item.lower() for item in allowed}
+        return lowered in _lowered_allowed(tuple(allowed))
 
     @staticmethod
-    def _detect_enum_options(field_description: str) -> list[str]:
-        from .heuristics import HeuristicExtractor  # Lazy import to avoid cycles
-
-        return HeuristicExtractor._parse_enum_options(field_description.lower())
+    def _detect_enum_options(field_description: str) -> Tuple[str, ...]:
+        return _detect_enum_options(field_description)
 
     @staticmethod
     def validate_field(
@@ -78,41 +82,130 @@ class Validator:
         if not candidate:
             return False, None
 
-        field_lower = field_name.lower()
         desc_lower = field_description.lower()
+        kind = _classify_field(field_name.lower(), desc_lower)
+        return _KIND_VALIDATORS[kind](candidate, desc_lower)
 
-        if "cpf" in field_lower or "cpf" in desc_lower:
-            if Validator.validate_cpf(candidate):
-                digits = Validator.DIGITS_ONLY_REGEX.sub("", candidate)
-                normalized = (
-                    f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:11]}"
-                    if len(digits) == 11
-                    else candidate
-                )
-                return True, normalized
-            return False, None
+    @staticmethod
+    def validate_many(items: Sequence[Tuple[str, Any, str]]) -> List[Tuple[bool, Optional[Any]]]:
+        """Validate ``(field_name, value, description)`` triples in bulk.
+
+        Results match calling ``validate_field`` per item, in input order.
+        Fields are grouped by kind first so each group runs through one
+        validator, and CPF groups are normalized with a single regex pass.
+        """
+
+        results: List[Tuple[bool, Optional[Any]]] = [(False, None)] * len(items)
+        groups: Dict[str, List[Tuple[int, str, str]]] = defaultdict(list)
+        for index, (field_name, value, field_description) in enumerate(items):
+            if value is None:
+                continue
+            candidate = value.strip() if isinstance(value, str) else str(value).strip()
+            if not candidate:
+                continue
+            desc_lower = (field_description or "").lower()
+            groups[_classify_field(field_name.lower(), desc_lower)].append((index, candidate, desc_lower))
+
+        for kind, members in groups.items():
+            if kind == "cpf" and len(members) > 1:
+                outcomes = _validate_cpf_batch([candidate for _, candidate, _ in members])
+                for (index, _, _), outcome in zip(members, outcomes):
+                    results[index] = outcome
+                continue
+            validate = _KIND_VALIDATORS[kind]
+            for index, candidate, desc_lower in members:
+                results[index] = validate(candidate, desc_lower)
+        return results
+
+
+def _validate_cpf_kind(candidate: str, desc_lower: str) -> Tuple[bool, Optional[Any]]:
+    if Validator.validate_cpf(candidate):
+        digits = Validator.DIGITS_ONLY_REGEX.sub("", candidate)
+        normalized = (
+            f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:11]}"
+            if len(digits) == 11
+            else candidate
+        )
+        return True, normalized
+    return False, None
+
+
+def _validate_cpf_batch(candidates: List[str]) -> List[Tuple[bool, Optional[Any]]]:
+    """Strip non-digits from every candidate in one ``re.sub`` over the joined batch."""
+
+    if any("\n" in candidate for candidate in candidates):
+        return [_validate_cpf_kind(candidate, "") for candidate in candidates]
+    digits_batch = Validator.NON_DIGIT_KEEP_NEWLINE_REGEX.sub("", "\n".join(candidates)).split("\n")
+    cpf_digits = Validator.CPF_DIGITS_REGEX.match
+    outcomes: List[Tuple[bool, Optional[Any]]] = []
+    for digits in digits_batch:
+        if cpf_digits(digits) and digits != digits[0] * 11:
+            outcomes.append((True, f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:11]}"))
+        else:
+            outcomes.append((False, None))
+    return outcomes
+
+
+def _validate_email_kind(candidate: str, desc_lower: str) -> Tuple[bool, Optional[Any]]:
+    is_valid = Validator.validate_email(candidate)
+    return is_valid, candidate if is_valid else None
 
-        if "email" in field_lower or "email" in desc_lower:
-            is_valid = Validator.validate_email(candidate)
-            return is_valid, candidate if is_valid else None
-
-        if any(word in field_lower for word in ("telefone", "celular", "phone")) or any(
-            word in desc_lower for word in ("telefone", "celular", "phone")
-        ):
-            is_valid = Validator.validate_phone(candidate)
-            return is_valid, candidate if is_valid else None
-
-        if any(word in field_lower for word in ("data", "nascimento", "emissao")) or any(
-            word in desc_lower for word in ("data", "nascimento", "emissao")
-        ):
-            if Validator.validate_date(candidate):
-                return True, candidate
-            return False, None
 
-        enum_options = Validator._detect_enum_options(desc_lower)
-        if enum_options:
-            is_valid = Validator.validate_enum(candidate, enum_options)
-            return is_valid, candidate if is_valid else None
+def _validate_phone_kind(candidate: str, desc_lower: str) -> Tuple[bool, Optional[Any]]:
+    is_valid = Validator.validate_phone(candidate)
+    return is_valid, candidate if is_valid else None
 
-        # Default: accept as string
+
+def _validate_date_kind(candidate: str, desc_lower: str) -> Tuple[bool, Optional[Any]]:
+    if Validator.validate_date(candidate):
         return True, candidate
+    return False, None
+
+
+def _validate_enum_kind(candidate: str, desc_lower: str) -> Tuple[bool, Optional[Any]]:
+    is_valid = Validator.validate_enum(candidate, _detect_enum_options(desc_lower))
+    return is_valid, candidate if is_valid else None
+
+
+def _validate_string_kind(candidate: str, desc_lower: str) -> Tuple[bool, Optional[Any]]:
+    # Default: accept as string
+    return True, candidate
+
+
+_KIND_VALIDATORS = {
+    "cpf": _validate_cpf_kind,
+    "email": _validate_email_kind,
+    "phone": _validate_phone_kind,
+    "date": _validate_date_kind,
+    "enum": _validate_enum_kind,
+    "string": _validate_string_kind,
+}
+
+
+@lru_cache(maxsize=1024)
+def _classify_field(field_lower: str, desc_lower: str) -> str:
+    """Resolve which validator applies to a field; checked in priority order."""
+
+    if "cpf" in field_lower or "cpf" in desc_lower:
+        return "cpf"
+    if "email" in field_lower or "email" in desc_lower:
+        return "email"
+    if Validator.PHONE_FIELD_REGEX.search(field_lower) or Validator.PHONE_FIELD_REGEX.search(desc_lower):
+        return "phone"
+    if Validator.DATE_FIELD_REGEX.search(field_lower) or Validator.DATE_FIELD_REGEX.search(desc_lower):
+        return "date"
+    if _detect_enum_options(desc_lower):
+        return "enum"
+    return "string"
+
+
+@lru_cache(maxsize=512)
+def _detect_enum_options(field_description: str) -> Tuple[str, ...]:
+    from .heuristics import HeuristicExtractor  # Lazy import to avoid cycles
+
+    return HeuristicExtractor._parse_enum_options(field_description.lower())
+
+
+@lru_cache(maxsize=512)
+def _lowered_allowed(allowed: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(item.lower() for item in allowed)
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from .cache.memory_cache import schema_fingerprint
 
 
 class ExtractionRequest(BaseModel):
@@ -19,7 +22,31 @@ class ExtractionRequest(BaseModel):
         alias="schema",
         description="Mapping of field name to human-readable description"
     )
-    pdf_path: str = Field(..., description="Filesystem path to the PDF asset to parse")
+    pdf_path: Optional[str] = Field(default=None, description="Filesystem path to the PDF asset to parse")
+    pdf_bytes: Optional[bytes] = Field(
+        default=None,
+        exclude=True,
+        repr=False,
+        description="Raw PDF content, used instead of ``pdf_path`` to skip the temporary file",
+    )
+
+    @model_validator(mode="after")
+    def _require_pdf(self) -> "ExtractionRequest":
+        if self.pdf_path is None and self.pdf_bytes is None:
+            raise ValueError("Either pdf_path or pdf_bytes must be provided")
+        return self
+
+    @property
+    def pdf_source(self) -> Union[str, bytes]:
+        """The in-memory PDF when given, otherwise its path."""
+
+        return self.pdf_bytes if self.pdf_bytes is not None else self.pdf_path
+
+    @cached_property
+    def schema_fingerprint(self) -> str:
+        """Order-independent fingerprint of the schema fields, computed once per request."""
+
+        return schema_fingerprint(self.extraction_schema)
 
 
 class FieldResult(BaseModel):
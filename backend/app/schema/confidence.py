@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import Any
 
+_APPROX_MARKERS = ("aproximado",)
+# Separators ignored when deciding whether a value is numeric
+_NUMERIC_STRIP = str.maketrans("", "", "., ")
+
 
 class ConfidenceScorer:
     """Computes confidence scores for extracted fields and retry policies."""
@@ -20,18 +25,20 @@ class ConfidenceScorer:
         "not_found": 0.0,
     }
 
-    CRITICAL_FIELDS = {
-        "cpf",
-        "cnpj",
-        "email",
-        "telefone",
-        "celular",
-        "data",
-        "nascimento",
-        "emissao",
-        "valor",
-        "total",
-    }
+    CRITICAL_FIELDS = frozenset(
+        {
+            "cpf",
+            "cnpj",
+            "email",
+            "telefone",
+            "celular",
+            "data",
+            "nascimento",
+            "emissao",
+            "valor",
+            "total",
+        }
+    )
 
     @staticmethod
     def score_extraction(
@@ -55,11 +62,10 @@ class ConfidenceScorer:
         if ConfidenceScorer._looks_numeric(value):
             base += 0.03
 
-        field_lower = field.lower()
-        if field_lower in ConfidenceScorer.CRITICAL_FIELDS:
+        if _field_is_critical(field):
             base -= 0.02  # critical fields require higher scrutiny
 
-        if description and "aproximado" in description.lower():
+        if description and _is_approximate(description):
             base -= 0.05
 
         if context and len(context) < 40:
@@ -71,10 +77,7 @@ class ConfidenceScorer:
     def should_retry_with_llm(confidence: float, field: str) -> bool:
         """Decide if we should attempt a more expensive recovery step."""
 
-        field_lower = field.lower()
-        threshold = 0.78
-        if field_lower in ConfidenceScorer.CRITICAL_FIELDS:
-            threshold = 0.85
+        threshold = 0.85 if _field_is_critical(field) else 0.78
         return confidence < threshold
 
     @staticmethod
@@ -82,6 +85,18 @@ class ConfidenceScorer:
         if isinstance(value, (int, float)):
             return True
         if isinstance(value, str):
-            raw = value.replace(".", "").replace(",", "").replace(" ", "")
-            return raw.isdigit()
+            return value.translate(_NUMERIC_STRIP).isdigit()
         return False
+
+
+# Field names and descriptions repeat across every extraction of a schema,
+# so their lowercased lookups are memoized instead of recomputed per score.
+@lru_cache(maxsize=1024)
+def _field_is_critical(field: str) -> bool:
+    return field.lower() in ConfidenceScorer.CRITICAL_FIELDS
+
+
+@lru_cache(maxsize=1024)
+def _is_approximate(description: str) -> bool:
+    desc_lower = description.lower()
+    return any(marker in desc_lower for marker in _APPROX_MARKERS)
@@ -2,17 +2,43 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+FieldKey = Tuple[str, str]
 
 
 class SchemaLearner:
-    """Captures observed extraction strategies per label/field."""
+    """Captures observed extraction strategies per label/field.
+
+    Observations live in flat dicts keyed by ``(label, field)`` so the per-field
+    ``suggest_source_for_field`` call is a single hash lookup. ``_fields_by_label``
+    is the reverse index used to enforce limits and rebuild per-label views.
+    """
 
     MAX_PATTERNS_PER_LABEL = 50  # Prevent unbounded growth
     MAX_LABELS = 100
 
     def __init__(self) -> None:
-        self.learned: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._last_source: Dict[FieldKey, str] = {}
+        self._example: Dict[FieldKey, Any] = {}
+        self._description: Dict[FieldKey, str] = {}
+        self._fields_by_label: Dict[str, Dict[str, None]] = {}
+
+    @property
+    def learned(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Nested ``{label: {field: pattern}}`` snapshot of everything learned."""
+
+        return {label: self.get_patterns(label) for label in self._fields_by_label}
+
+    @learned.setter
+    def learned(self, value: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        for store in (self._last_source, self._example, self._description, self._fields_by_label):
+            store.clear()
+        for label, fields in value.items():
+            label_fields = self._fields_by_label.setdefault(label, {})
+            for field, pattern in fields.items():
+                self._store(label, field, pattern.get("last_source"), pattern.get("example"), pattern.get("description"))
+                label_fields[field] = None
 
     def learn_from_result(
         self,
@@ -24,34 +50,51 @@ class SchemaLearner:
         """Store how each field was extracted for future hints."""
 
         # Prevent unbounded growth of labels
-        if len(self.learned) >= self.MAX_LABELS:
+        if len(self._fields_by_label) >= self.MAX_LABELS:
             return
 
-        label_store = self.learned.setdefault(label, {})
+        label_fields = self._fields_by_label.setdefault(label, {})
 
         # Prevent unbounded growth of patterns per label
-        if len(label_store) >= self.MAX_PATTERNS_PER_LABEL:
+        if len(label_fields) >= self.MAX_PATTERNS_PER_LABEL:
             return
 
         for field, value in results.items():
             if value in (None, "", [], {}, ()):
                 continue
-            label_store[field] = {
-                "last_source": source_analysis.get(field, "unknown"),
-                "example": value,
-                "description": schema.get(field, ""),
-            }
+            self._store(label, field, source_analysis.get(field, "unknown"), value, schema.get(field, ""))
+            label_fields[field] = None
 
     def get_patterns(self, label: str) -> Dict[str, Dict[str, Any]]:
-        """Return stored patterns for ``label`` if present."""
+        """Return a fresh ``{field: pattern}`` view of what was learned for ``label``."""
 
-        return self.learned.get(label, {})
+        fields = self._fields_by_label.get(label)
+        if not fields:
+            return {}
+        patterns: Dict[str, Dict[str, Any]] = {}
+        for field in fields:
+            key = (label, field)
+            patterns[field] = {
+                "last_source": self._last_source.get(key),
+                "example": self._example.get(key),
+                "description": self._description.get(key),
+            }
+        return patterns
 
     def suggest_source_for_field(self, label: str, field: str) -> str:
         """Suggest whether a field historically worked better via heuristics or LLM."""
 
-        patterns = self.get_patterns(label)
-        field_pattern = patterns.get(field)
-        if not field_pattern:
-            return "unknown"
-        return field_pattern.get("last_source", "unknown") or "unknown"
+        return self._last_source.get((label, field)) or "unknown"
+
+    def _store(
+        self,
+        label: str,
+        field: str,
+        last_source: Optional[str],
+        example: Any,
+        description: Optional[str],
+    ) -> None:
+        key = (label, field)
+        self._last_source[key] = last_source
+        self._example[key] = example
+        self._description[key] = description
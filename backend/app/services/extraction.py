@@ -3,25 +3,107 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
+import json
 import logging
-from typing import Any, Dict, Iterable, Optional
+import os
+from collections import OrderedDict
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
-from ..cache import MemoryCache
+import xxhash
+
+from ..cache import MemoryCache, TieredCache
+from ..cache.memory_cache import hash_pdf_bytes, hash_pdf_file, result_cache_key
 from ..config import get_settings
 from ..extractors import (
+    HeuristicContext,
     HeuristicExtractor,
     LLMExtractor,
     PDFExtractor,
     Validator,
-    extract_with_recovery,
+    recover_fields,
 )
+from ..extractors.pdf_extractor import PDFSource
 from ..models import ExtractionMetadata, ExtractionRequest, ExtractionResult, FieldResult
 from ..schema import ConfidenceScorer, SchemaLearner
-from ..utils import ProfileCollector, build_compact_context
+from ..utils import ContextIndex, ProfileCollector, build_compact_context
 
 LOGGER = logging.getLogger(__name__)
 
+_PDF_DIGEST_CACHE_SIZE = 1024
+_CONTEXT_CACHE_SIZE = 512
+_CONTEXT_INDEX_CACHE_SIZE = 64
+# Sources reported as-is when every found field came from them; anything else is "mixed"
+_SINGLE_SOURCE_LABELS = frozenset({"heuristic", "llm", "template"})
+
+ContextKey = Tuple[str, FrozenSet[Tuple[str, str]], Tuple[Tuple[str, str], ...], int]
+
+
+class FieldPayload:
+    """Mutable per-field extraction state; slotted since one exists per schema field."""
+
+    __slots__ = ("value", "source", "confidence", "validated", "needs_retry")
+
+    def __init__(self) -> None:
+        self.value: Any = None
+        self.source = "not_found"
+        self.confidence = 0.0
+        self.validated = False
+        self.needs_retry = False
+
+    def update(self, value: Any, source: str, confidence: float, needs_retry: Optional[bool] = None) -> None:
+        """Record a validated candidate; ``needs_retry`` is left untouched unless given."""
+
+        self.value = value
+        self.source = source
+        self.confidence = confidence
+        self.validated = True
+        if needs_retry is not None:
+            self.needs_retry = needs_retry
+
+
+class _MetadataAccumulator:
+    """Sums LLM usage across the batch and recovery calls of one extraction."""
+
+    __slots__ = ("duration_ms", "prompt_tokens", "completion_tokens", "total_tokens", "model")
+
+    _COUNTERS = ("duration_ms", "prompt_tokens", "completion_tokens", "total_tokens")
+
+    def __init__(self) -> None:
+        self.duration_ms = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.model: Optional[str] = None
+
+    def merge(self, new: Dict[str, Any]) -> None:
+        if not isinstance(new, dict):
+            return
+
+        for key in self._COUNTERS:
+            value = new.get(key)
+            if value is None:
+                continue
+            if not isinstance(value, int):
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    continue
+            setattr(self, key, getattr(self, key) + value)
+
+        model = new.get("model")
+        if model:
+            self.model = model
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Return the non-zero counters (and model) as ``ExtractionMetadata`` input."""
+
+        payload: Dict[str, Any] = {key: getattr(self, key) for key in self._COUNTERS if getattr(self, key)}
+        if self.model:
+            payload["model"] = self.model
+        return payload
+
 
 class ExtractionService:
     """Coordinates PDF parsing, heuristics, recovery, and LLM field extraction."""
@@ -36,27 +118,79 @@ class ExtractionService:
         schema_learner: Optional[SchemaLearner] = None,
     ) -> None:
         self.pdf_extractor = pdf_extractor or PDFExtractor()
-        self.llm_extractor = llm_extractor or LLMExtractor()
         self.heuristic_extractor = heuristic_extractor or HeuristicExtractor()
         self.validator = validator or Validator()
-        self.cache = cache or MemoryCache()
-        self.schema_learner = schema_learner or SchemaLearner()
+        # LLM answers go through the same validator as the heuristic and recovery paths
+        self.llm_extractor = llm_extractor or LLMExtractor(validator=self.validator)
         settings = get_settings()
+        self.cache = cache or self._build_cache(settings)
+        self.schema_learner = schema_learner or SchemaLearner()
         self.llm_context_chars = min(1800, settings.extraction_max_chars)
         self.max_table_rows = 40
+        self.pdf_parallel_workers = settings.pdf_parallel_workers
+        self.use_pdfplumber_text = settings.use_pdfplumber_text
+        self.detailed_profiling = settings.detailed_profiling
+        # (path, mtime_ns, size) -> digest, so unchanged files are hashed once
+        self._pdf_digest_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._pdf_digest_lock = Lock()
+        # Compact LLM contexts per (pdf, schema, learned examples), FIFO-capped
+        self._context_cache: Dict[ContextKey, str] = {}
+        # pdf_hash -> keyword index, so repeat documents skip normalization and searches
+        self._context_indexes: "OrderedDict[str, ContextIndex]" = OrderedDict()
+        # Identical LLM prompts in flight share one request
+        self._inflight: Dict[str, "asyncio.Task[Tuple[Dict[str, Any], Dict[str, Any]]]"] = {}
+
+    @staticmethod
+    def _result_from_payload(payload: Dict[str, Any]) -> ExtractionResult:
+        """Rebuild a cached result without validation; the payload is our own ``model_dump``."""
+
+        return ExtractionResult.model_construct(
+            label=payload["label"],
+            results=[FieldResult.model_construct(**item) for item in payload["results"]],
+            metadata=ExtractionMetadata.model_construct(**payload["metadata"]),
+            flat=payload["flat"],
+        )
+
+    @staticmethod
+    def _build_cache(settings: Any) -> MemoryCache:
+        """Use the disk-backed tier when a cache directory is configured."""
+
+        if settings.cache_dir:
+            LOGGER.info("Using disk cache tier at %s", settings.cache_dir)
+            return TieredCache(
+                settings.cache_dir,
+                max_entries=settings.cache_max_entries,
+                max_bytes=settings.cache_max_bytes,
+            )
+        return MemoryCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+        )
+
+    def close(self) -> None:
+        """Flush pending cache writes and release cache resources."""
+
+        self.cache.close()
 
     async def extract(self, request: ExtractionRequest) -> ExtractionResult:
         LOGGER.info("Starting extraction label=%s fields=%s", request.label, len(request.extraction_schema))
 
-        cache_key = await self._build_cache_key(request)
-        cached_payload = self.cache.get_pdf_result(cache_key)
+        if request.pdf_bytes is not None:
+            # xxh3 runs at memory bandwidth; not worth a thread hop
+            pdf_hash = hash_pdf_bytes(request.pdf_bytes)
+        else:
+            pdf_hash = await self._hash_pdf_async(request.pdf_path)
+        cache_key = self._build_cache_key(request, pdf_hash)
+        cached_payload = await self.cache.get_pdf_result_async(cache_key)
         if cached_payload:
             LOGGER.info("Cache hit label=%s", request.label)
-            cached_result = ExtractionResult.model_validate(cached_payload)
+            # The payload is a freshly unpickled private copy, so the model built
+            # around it can be handed out without copying again
+            cached_result = self._result_from_payload(cached_payload)
             cached_result.metadata.source = "cache"
             return cached_result
 
-        profiler = ProfileCollector()
+        profiler = ProfileCollector(enabled=self.detailed_profiling)
         text: str
         tables: Any
         field_values: Dict[str, Any]
@@ -66,63 +200,43 @@ class ExtractionService:
 
         with profiler.track("total_ms"):
             # Try to get PDF content from cache
-            pdf_hash = await self._hash_pdf_async(request.pdf_path)
-            cached_content = self.cache.get_pdf_content(pdf_hash)
+            cached_content = await self.cache.get_pdf_content_async(pdf_hash)
 
             if cached_content:
                 LOGGER.info("PDF content cache hit hash=%s", pdf_hash[:8])
                 text, tables = cached_content
             else:
-                with profiler.track("pdf_text_ms"):
-                    text = self.pdf_extractor.extract_text(request.pdf_path)
-                with profiler.track("pdf_tables_ms"):
-                    tables = self.pdf_extractor.extract_tables(request.pdf_path)
+                with profiler.track("pdf_parse_ms"):
+                    text, tables = await self._parse_pdf(request.pdf_source, profiler)
                 tables = self._limit_tables(tables, self.max_table_rows)
                 self.cache.set_pdf_content(pdf_hash, text, tables)
                 LOGGER.debug("PDF content cached hash=%s tables=%s", pdf_hash[:8], len(tables or []))
 
             learned_patterns = self.schema_learner.get_patterns(request.label)
+            context_index = self._context_index(pdf_hash, text)
 
-            field_details: Dict[str, Dict[str, Any]] = {
-                field: {
-                    "value": None,
-                    "source": "not_found",
-                    "confidence": 0.0,
-                    "validated": False,
-                    "needs_retry": False,
-                }
-                for field in request.extraction_schema
-            }
+            field_details: Dict[str, FieldPayload] = {field: FieldPayload() for field in request.extraction_schema}
 
             llm_schema: Dict[str, str] = {}
-            metadata_aggregate: Dict[str, Any] = {
-                "duration_ms": 0,
-                "prompt_tokens": 0,
-                "completion_tokens": 0,
-                "total_tokens": 0,
-                "model": None,
-            }
+            metadata_aggregate = _MetadataAccumulator()
             had_llm_call = False
 
+            # The document scan and every field's regex lookups are pure CPU work;
+            # run them together in one worker thread to keep the event loop free.
+            with profiler.track("heuristics_ms"):
+                heuristic_context, heuristic_values = await asyncio.to_thread(
+                    self._run_heuristic_phase, text, request.label, request.extraction_schema, context_index
+                )
+
             for field, description in request.extraction_schema.items():
                 info = field_details[field]
-                preferred_source = self.schema_learner.suggest_source_for_field(request.label, field)
-
-                heuristic_value = None
-                if preferred_source != "llm":
-                    with profiler.track("heuristics_ms"):
-                        heuristic_value = self._run_heuristics(
-                            self.heuristic_extractor,
-                            field,
-                            description or "",
-                            text,
-                        )
-
+                heuristic_value = heuristic_values[field]
                 if heuristic_value is not None:
-                    with profiler.track("validation_ms"):
-                        is_valid, normalized = self.validator.validate_field(
-                            field, heuristic_value, description or ""
-                        )
+                    if profiler.enabled:
+                        started_ns = perf_counter_ns()
+                    is_valid, normalized = self.validator.validate_field(field, heuristic_value, description or "")
+                    if profiler.enabled:
+                        profiler.add("validation_ms", perf_counter_ns() - started_ns)
                     if is_valid:
                         self._log_field_event(field, "heuristic_success")
                         confidence = ConfidenceScorer.score_extraction(
@@ -134,31 +248,25 @@ class ExtractionService:
                             validated=True,
                         )
                         info.update(
-                            value=normalized,
-                            source="heuristic",
-                            confidence=confidence,
-                            validated=True,
+                            normalized,
+                            "heuristic",
+                            confidence,
                             needs_retry=ConfidenceScorer.should_retry_with_llm(confidence, field),
                         )
 
-                        if info["needs_retry"]:
+                        if info.needs_retry:
                             llm_schema[field] = description
                             self._log_field_event(field, "heuristic_low_confidence", confidence=confidence)
                     continue
 
-                info["needs_retry"] = True
+                info.needs_retry = True
                 llm_schema[field] = description
                 self._log_field_event(field, "heuristic_failed")
 
             if llm_schema:
-                llm_context = build_compact_context(
-                    text,
-                    llm_schema,
-                    learned_patterns,
-                    max_chars=self.llm_context_chars,
-                )
+                llm_context = await self._compact_context(pdf_hash, context_index, llm_schema, learned_patterns)
                 with profiler.track("llm_batch_ms"):
-                    llm_fields, llm_metadata = await self.llm_extractor.extract_fields(
+                    llm_fields, llm_metadata = await self._extract_fields_coalesced(
                         text=llm_context,
                         label=request.label,
                         schema=llm_schema,
@@ -170,16 +278,20 @@ class ExtractionService:
                     len(llm_schema),
                     llm_metadata.get("total_tokens"),
                 )
-                self._merge_metadata(metadata_aggregate, llm_metadata)
+                metadata_aggregate.merge(llm_metadata)
                 profiler.record("llm_ms", llm_metadata.get("duration_ms"))
                 had_llm_call = True
 
+                # extract_fields already validated every field while parsing the response
                 for field, description in llm_schema.items():
+                    raw, normalized, is_valid = llm_fields.get(field, (None, None, False))
                     info = field_details[field]
-                    candidate = llm_fields.get(field)
-                    with profiler.track("validation_ms"):
-                        is_valid, normalized = self.validator.validate_field(field, candidate, description or "")
-
+                    if raw is None:
+                        # Missing from the response: nothing to score, go straight to recovery
+                        info.needs_retry = True
+                        if info.value is None:
+                            self._log_field_event(field, "schedule_recovery", confidence=info.confidence)
+                        continue
                     if is_valid and normalized not in (None, "", [], {}):
                         self._log_field_event(field, "llm_success")
                         confidence = ConfidenceScorer.score_extraction(
@@ -190,41 +302,32 @@ class ExtractionService:
                             context=description or "",
                             validated=True,
                         )
-                        if confidence >= info["confidence"]:
-                            info.update(
-                                value=normalized,
-                                source="llm",
-                                confidence=confidence,
-                                validated=True,
-                            )
-                    info["needs_retry"] = ConfidenceScorer.should_retry_with_llm(info["confidence"], field)
-                    if info["value"] is None:
-                        info["needs_retry"] = True
-                        self._log_field_event(field, "schedule_recovery", confidence=info["confidence"])
+                        if confidence >= info.confidence:
+                            info.update(normalized, "llm", confidence)
+                    info.needs_retry = ConfidenceScorer.should_retry_with_llm(info.confidence, field)
+                    if info.value is None:
+                        info.needs_retry = True
+                        self._log_field_event(field, "schedule_recovery", confidence=info.confidence)
 
             # Collect fields that need recovery
-            fields_to_recover = []
+            fields_to_recover: Dict[str, str] = {}
             for field, description in request.extraction_schema.items():
                 info = field_details[field]
-                if info.get("needs_retry", False) and info.get("value") is None:
-                    fields_to_recover.append((field, description or ""))
+                if info.needs_retry and info.value is None:
+                    fields_to_recover[field] = description or ""
 
-            # Process recovery in parallel
+            # Recover every pending field with at most one batched LLM call
             if fields_to_recover:
                 with profiler.track("recovery_ms"):
-                    recovery_tasks = []
-                    for field, description in fields_to_recover:
-                        field_context = build_compact_context(
-                            text,
-                            {field: description},
-                            learned_patterns,
-                            max_chars=self.llm_context_chars,
-                        )
-                        task = extract_with_recovery(
-                            field=field,
-                            description=description,
+                    recovery_context = await self._compact_context(
+                        pdf_hash, context_index, fields_to_recover, learned_patterns
+                    )
+                    try:
+                        recovered, recovery_metadata = await recover_fields(
+                            fields=fields_to_recover,
                             text=text,
-                            context_text=field_context,
+                            context_text=recovery_context,
+                            heuristic_context=heuristic_context,
                             label=request.label,
                             heuristic_extractor=self.heuristic_extractor,
                             validator=self.validator,
@@ -232,40 +335,31 @@ class ExtractionService:
                             schema_learner=self.schema_learner,
                             tables=tables,
                         )
-                        recovery_tasks.append((field, description, task))
+                    except Exception as exc:  # recovery is best-effort
+                        LOGGER.error("Recovery failed for fields %s: %s", list(fields_to_recover), exc)
+                        recovered, recovery_metadata = {}, {}
 
-                    # Execute all recovery tasks in parallel
-                    recovery_results = await asyncio.gather(
-                        *[task for _, _, task in recovery_tasks],
-                        return_exceptions=True
-                    )
+                    # Usage of the batched recovery call is reported whenever it ran,
+                    # not only when one of its answers was kept
+                    if recovery_metadata:
+                        metadata_aggregate.merge(recovery_metadata)
+                        profiler.record("llm_ms", recovery_metadata.get("duration_ms"))
+                        had_llm_call = True
 
                     # Process recovery results
-                    for (field, description, _), result in zip(recovery_tasks, recovery_results):
+                    for field, description in fields_to_recover.items():
                         info = field_details[field]
-
-                        if isinstance(result, Exception):
-                            LOGGER.error("Recovery failed for field '%s': %s", field, result)
-                            info["needs_retry"] = False
-                            continue
-
-                        recovered_value, recovered_source, recovery_metadata = result
-
-                        if recovery_metadata:
-                            self._merge_metadata(metadata_aggregate, recovery_metadata)
-                            profiler.record("llm_ms", recovery_metadata.get("duration_ms"))
-                            had_llm_call = had_llm_call or "llm" in recovered_source
+                        info.needs_retry = False
+                        recovered_value, recovered_source = recovered.get(field, (None, "not_found"))
 
                         if recovered_value is None:
                             self._log_field_event(field, "recovery_no_value")
-                            info["needs_retry"] = False
                             continue
 
-                        with profiler.track("validation_ms"):
-                            is_valid, normalized = self.validator.validate_field(field, recovered_value, description)
-                        if not is_valid or normalized in (None, "", [], {}):
+                        # recover_fields only returns values already validated and normalized
+                        normalized = recovered_value
+                        if normalized in ("", [], {}):
                             self._log_field_event(field, "recovery_invalid")
-                            info["needs_retry"] = False
                             continue
 
                         confidence = ConfidenceScorer.score_extraction(
@@ -277,34 +371,26 @@ class ExtractionService:
                             validated=True,
                         )
 
-                        if confidence >= info["confidence"]:
-                            info.update(
-                                value=normalized,
-                                source=recovered_source,
-                                confidence=confidence,
-                                validated=True,
-                            )
+                        if confidence >= info.confidence:
+                            info.update(normalized, recovered_source, confidence)
                             self._log_field_event(field, "recovery_success", source=recovered_source)
 
-                        info["needs_retry"] = False
-                        had_llm_call = had_llm_call or recovered_source.startswith("llm")
-
-            field_values = {field: details["value"] for field, details in field_details.items()}
-            field_sources = {field: details["source"] for field, details in field_details.items()}
+            field_values = {field: details.value for field, details in field_details.items()}
+            field_sources = {field: details.source for field, details in field_details.items()}
 
-            results_list = list(self._build_field_results(field_details))
+            # Internal values only: skip per-field pydantic validation
+            results_list = [
+                FieldResult.model_construct(
+                    field_name=field,
+                    value=details.value,
+                    source=details.source,
+                    confidence=round(details.confidence, 2),
+                )
+                for field, details in field_details.items()
+            ]
 
             metadata_source = self._resolve_metadata_source(field_sources)
-            metadata_payload = {}
-
-            if had_llm_call:
-                for key in ("duration_ms", "prompt_tokens", "completion_tokens", "total_tokens"):
-                    value = metadata_aggregate.get(key)
-                    if value:
-                        metadata_payload[key] = value
-                if metadata_aggregate.get("model"):
-                    metadata_payload["model"] = metadata_aggregate["model"]
-
+            metadata_payload = metadata_aggregate.to_payload() if had_llm_call else {}
             metadata_payload["source"] = metadata_source
 
         profiling_snapshot = profiler.snapshot()
@@ -325,7 +411,8 @@ class ExtractionService:
             source_analysis=field_sources,
         )
 
-        extraction_metadata = ExtractionMetadata.model_validate(metadata_payload)
+        # Counters were already coerced to int by the accumulator; no need to revalidate
+        extraction_metadata = ExtractionMetadata.model_construct(**metadata_payload)
         extraction_result = ExtractionResult(
             label=request.label,
             results=results_list,
@@ -342,65 +429,61 @@ class ExtractionService:
         )
         return extraction_result
 
+    def _run_heuristic_phase(
+        self,
+        text: str,
+        label: str,
+        schema: Dict[str, str],
+        context_index: Optional[ContextIndex] = None,
+    ) -> Tuple[HeuristicContext, Dict[str, Optional[str]]]:
+        """Scan ``text`` once and run heuristics for every field not known to need the LLM.
+
+        ``context_index`` has its normalized text computed here as well, so the
+        compact-context builds for the LLM batch and its retries find it ready
+        instead of normalizing the whole document on the event loop.
+        """
+        if context_index is not None:
+            context_index.normalized_text  # computed once and cached on the index
+        context = HeuristicContext(text)
+        values: Dict[str, Optional[str]] = {}
+        for field, description in schema.items():
+            if self.schema_learner.suggest_source_for_field(label, field) == "llm":
+                values[field] = None
+                continue
+            values[field] = self._run_heuristics(self.heuristic_extractor, field, description or "", context)
+        return context, values
+
     @staticmethod
     def _run_heuristics(
         extractor: HeuristicExtractor,
         field: str,
         description: str,
-        text: str,
+        context: HeuristicContext,
     ) -> Optional[str]:
-        heur_value = extractor.extract_by_field_name(field, text)
+        heur_value = extractor.extract_by_field_name(field, context)
         if heur_value:
             return heur_value
 
-        heur_value = extractor.extract_by_description(description, text)
+        heur_value = extractor.extract_by_description(description, context)
         if heur_value:
             return heur_value
 
         if description:
-            heur_value = extractor.extract_enum_values(description, text)
+            heur_value = extractor.extract_enum_values(description, context)
         return heur_value
 
     @staticmethod
     def _resolve_metadata_source(field_sources: Dict[str, str]) -> str:
-        sources = {source for source in field_sources.values() if source != "not_found"}
-        if not sources:
-            return "unknown"
-        if sources == {"heuristic"}:
-            return "heuristic"
-        if sources == {"llm"}:
-            return "llm"
-        if sources == {"template"}:
-            return "template"
-        return "mixed"
-
-    @staticmethod
-    def _build_field_results(field_details: Dict[str, Dict[str, Any]]) -> Iterable[FieldResult]:
-        for field, details in field_details.items():
-            yield FieldResult(
-                field_name=field,
-                value=details["value"],
-                source=details["source"],
-                confidence=round(details["confidence"], 2),
-            )
-
-    @staticmethod
-    def _merge_metadata(target: Dict[str, Any], new: Dict[str, Any]) -> None:
-        if not isinstance(new, dict):
-            return
-
-        for key in ("duration_ms", "prompt_tokens", "completion_tokens", "total_tokens"):
-            value = new.get(key)
-            if value is None:
+        resolved: Optional[str] = None
+        for source in field_sources.values():
+            if source == "not_found" or source == resolved:
                 continue
-            try:
-                target[key] = target.get(key, 0) + int(value)
-            except (TypeError, ValueError):
-                continue
-
-        model = new.get("model")
-        if model:
-            target["model"] = model
+            if resolved is not None:
+                return "mixed"
+            resolved = source
+        if resolved is None:
+            return "unknown"
+        return resolved if resolved in _SINGLE_SOURCE_LABELS else "mixed"
 
     @staticmethod
     def _limit_tables(tables: Any, max_rows: int = 40) -> Any:
@@ -410,27 +493,137 @@ class ExtractionService:
             return tables
         return tables[:max_rows]
 
+    async def _parse_pdf(self, source: PDFSource, profiler: ProfileCollector) -> Tuple[str, Any]:
+        """Parse text and tables off the event loop, overlapping the two passes."""
+        if self.pdf_parallel_workers > 1:
+            return await asyncio.to_thread(
+                self.pdf_extractor.extract_all_parallel,
+                source,
+                workers=self.pdf_parallel_workers,
+                use_pdfplumber_text=self.use_pdfplumber_text,
+            )
+        if self.use_pdfplumber_text:
+            # One pdfplumber pass already yields both text and tables
+            return await asyncio.to_thread(self.pdf_extractor.extract_all, source, use_pdfplumber_text=True)
+
+        # PDFium (text) and pdfminer (tables) are independent parsers
+        text, tables = await asyncio.gather(
+            asyncio.to_thread(self._timed, profiler, "pdf_text_ms", self.pdf_extractor.extract_text, source),
+            asyncio.to_thread(self._timed, profiler, "pdf_tables_ms", self.pdf_extractor.extract_tables, source),
+        )
+        return text, tables
+
     @staticmethod
-    async def _build_cache_key(request: ExtractionRequest) -> str:
-        """Build cache key asynchronously to avoid blocking event loop."""
-        pdf_hash = await ExtractionService._hash_pdf_async(request.pdf_path)
-        schema_fingerprint = "|".join(sorted(request.extraction_schema.keys()))
-        return f"{request.label}:{pdf_hash}:{schema_fingerprint}"
+    def _timed(profiler: ProfileCollector, name: str, func: Any, *args: Any) -> Any:
+        with profiler.track(name):
+            return func(*args)
+
+    async def _extract_fields_coalesced(
+        self,
+        text: str,
+        label: str,
+        schema: Dict[str, str],
+        tables: Any,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Call the LLM, joining an identical request already in flight instead of repeating it."""
+        hasher = xxhash.xxh3_128()
+        hasher.update(label.encode())
+        hasher.update(json.dumps(schema, ensure_ascii=False, sort_keys=True).encode())
+        hasher.update(text.encode())
+        if tables:
+            hasher.update(json.dumps(tables, ensure_ascii=False, default=str).encode())
+        key = hasher.hexdigest()
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.llm_extractor.extract_fields(text=text, label=label, schema=schema, tables=tables)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release_inflight(key, done))
+        else:
+            LOGGER.info("Joining in-flight LLM request label=%s fields=%s", label, len(schema))
+
+        # Shield so one cancelled caller does not cancel the request for the others
+        fields, metadata = await asyncio.shield(task)
+        return dict(fields), dict(metadata)
+
+    def _release_inflight(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Every awaiter may have been cancelled; retrieve the error so asyncio
+        # does not report it as never retrieved. Awaiters still get it raised.
+        if not task.cancelled():
+            task.exception()
+
+    def _context_index(self, pdf_hash: str, text: str) -> ContextIndex:
+        index = self._context_indexes.get(pdf_hash)
+        if index is None:
+            index = self._context_indexes[pdf_hash] = ContextIndex(text)
+            if len(self._context_indexes) > _CONTEXT_INDEX_CACHE_SIZE:
+                self._context_indexes.popitem(last=False)
+        else:
+            self._context_indexes.move_to_end(pdf_hash)
+        return index
+
+    async def _compact_context(
+        self,
+        pdf_hash: str,
+        index: ContextIndex,
+        schema: Dict[str, str],
+        learned_patterns: Dict[str, Dict[str, Any]],
+    ) -> str:
+        """Return ``build_compact_context`` output, reusing it for repeated schemas.
+
+        New contexts are built in a worker thread. The keyword scan holds the
+        GIL, so this keeps the event loop responsive rather than adding
+        parallelism. The cache itself is only touched from the loop.
+        """
+        # Learned examples feed the keyword set, so they are part of the key
+        examples = tuple(
+            (field, repr((learned_patterns.get(field) or {}).get("example"))) for field in sorted(schema)
+        )
+        key = (pdf_hash, frozenset(schema.items()), examples, self.llm_context_chars)
+        context = self._context_cache.get(key)
+        if context is None:
+            context = await asyncio.to_thread(
+                build_compact_context,
+                index.text,
+                schema,
+                learned_patterns,
+                max_chars=self.llm_context_chars,
+                index=index,
+            )
+            if len(self._context_cache) >= _CONTEXT_CACHE_SIZE:
+                del self._context_cache[next(iter(self._context_cache))]
+            self._context_cache[key] = context
+        return context
 
     @staticmethod
-    async def _hash_pdf_async(pdf_path: str) -> str:
+    def _build_cache_key(request: ExtractionRequest, pdf_hash: str) -> str:
+        return result_cache_key(request.label, pdf_hash, request.schema_fingerprint)
+
+    async def _hash_pdf_async(self, pdf_path: str) -> str:
         """Hash PDF file asynchronously in thread pool to avoid blocking."""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, ExtractionService._hash_pdf_sync, pdf_path)
-
-    @staticmethod
-    def _hash_pdf_sync(pdf_path: str) -> str:
-        """Synchronous PDF hashing (run in thread pool)."""
-        hasher = hashlib.sha1()
-        with open(pdf_path, "rb") as pdf_file:
-            while chunk := pdf_file.read(8192):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+        return await loop.run_in_executor(None, self._hash_pdf_sync, pdf_path)
+
+    def _hash_pdf_sync(self, pdf_path: str) -> str:
+        """Synchronous PDF hashing (run in thread pool), memoized on file stat."""
+        stat = os.stat(pdf_path)
+        stat_key = (pdf_path, stat.st_mtime_ns, stat.st_size)
+        with self._pdf_digest_lock:
+            digest = self._pdf_digest_cache.get(stat_key)
+            if digest is not None:
+                self._pdf_digest_cache.move_to_end(stat_key)
+                return digest
+
+        digest = hash_pdf_file(pdf_path)
+        with self._pdf_digest_lock:
+            self._pdf_digest_cache[stat_key] = digest
+            if len(self._pdf_digest_cache) > _PDF_DIGEST_CACHE_SIZE:
+                self._pdf_digest_cache.popitem(last=False)
+        return digest
 
     @staticmethod
     def _log_field_event(field: str, message: str, **extra: Any) -> None:
@@ -1,6 +1,6 @@
 """Utility helpers for the backend application."""
 
 from .profiling import ProfileCollector
-from .context import build_compact_context
+from .context import ContextIndex, build_compact_context
 
-__all__ = ["ProfileCollector", "build_compact_context"]
+__all__ = ["ContextIndex", "ProfileCollector", "build_compact_context"]
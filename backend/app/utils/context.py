@@ -4,7 +4,89 @@ from __future__ import annotations
 
 import re
 import unicodedata
-from typing import Dict, Iterable, List, Tuple
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Collection, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+try:  # Optional accelerator: one automaton pass finds every keyword at once
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+class ContextIndex:
+    """Keyword positions in one document, shared by every context build over it.
+
+    The normalized text is computed on first use and each needle is searched at
+    most once, so the batched LLM pass and the recovery pass of an extraction
+    do not rescan the document for keywords they have in common.
+    """
+
+    __slots__ = ("text", "_normalized_text", "_positions")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._normalized_text: Optional[str] = None
+        self._positions: Dict[str, Tuple[int, ...]] = {}
+
+    @property
+    def normalized_text(self) -> str:
+        if self._normalized_text is None:
+            self._normalized_text = _normalize(self.text)
+        return self._normalized_text
+
+    def positions(self, needle: str) -> Tuple[int, ...]:
+        """Return start offsets of ``needle`` (already normalized) in the normalized text."""
+
+        cached = self._positions.get(needle)
+        if cached is None:
+            cached = self._positions[needle] = tuple(_find_all(self.normalized_text, needle))
+        return cached
+
+    def prefetch(self, needles: Collection[str]) -> None:
+        """Locate every needle not searched yet in a single pass over the text.
+
+        Uses a ``pyahocorasick`` automaton when installed, otherwise one
+        alternation regex over the needles that occur in the text at all.
+        """
+
+        missing = frozenset(needle for needle in needles if needle not in self._positions)
+        if not missing:
+            return
+        if ahocorasick is not None:
+            hits = (
+                (end - len(needle) + 1, needle)
+                for end, needle in _keyword_automaton(missing).iter(self.normalized_text)
+            )
+        else:
+            # ``in`` is CPython's bloom-filtered fast search, far cheaper than an
+            # extra alternative at every offset; absent needles are settled here
+            text = self.normalized_text
+            absent = [needle for needle in missing if needle not in text]
+            self._positions.update(dict.fromkeys(absent, ()))
+            missing = missing.difference(absent)
+            if not missing:
+                return
+            # The regex reports the longest needle at each offset, so needles that
+            # prefix another one are left to ``positions`` and searched on their own
+            missing = frozenset(
+                needle
+                for needle in missing
+                if not any(other != needle and other.startswith(needle) for other in missing)
+            )
+            hits = ((match.start(), match.group(1)) for match in _keyword_regex(missing).finditer(self.normalized_text))
+
+        found: Dict[str, List[int]] = {needle: [] for needle in missing}
+        next_free: Dict[str, int] = dict.fromkeys(missing, 0)
+        for start, needle in hits:
+            # Both scanners report overlapping hits; keep the ones ``re.finditer`` would
+            if start >= next_free[needle]:
+                found[needle].append(start)
+                next_free[needle] = start + len(needle)
+        for needle, starts in found.items():
+            self._positions[needle] = tuple(starts)
 
 
 def build_compact_context(
@@ -13,97 +95,207 @@ def build_compact_context(
     learned_patterns: Dict[str, Dict[str, str]] | None = None,
     max_chars: int = 2500,
     window: int = 240,
+    index: Optional[ContextIndex] = None,
 ) -> str:
     """Return a reduced text containing only the most relevant segments.
 
     The strategy:
     1. Gather keywords from field names, descriptions, and learned examples.
-    2. For each keyword locate occurrences in the document.
-    3. Extract sliding windows around occurrences and merge them.
-    4. If nothing matches, fall back to the start of the document.
+    2. For each keyword, longest first, locate occurrences in the document.
+    3. Extract sliding windows around occurrences until ``max_chars`` is
+       covered, dropping windows that overlap one already taken.
+    4. Join the windows in document order within ``max_chars``.
+    5. If nothing matches, fall back to the start of the document.
+
+    Pass an ``index`` built over ``full_text`` to reuse keyword searches
+    across calls on the same document.
     """
 
     if len(full_text) <= max_chars:
         return full_text
 
+    if index is None:
+        index = ContextIndex(full_text)
+    # Keywords arrive normalized and deduplicated. Longer, more
+    # specific keywords claim windows first, since selection stops at the budget.
     keywords = _collect_keywords(schema, learned_patterns or {})
-    segments: List[Tuple[int, str]] = []
-    normalized_text = _normalize(full_text)
-    used_spans: List[tuple[int, int]] = []
-
-    for keyword in keywords:
-        if len(keyword) < 3:
-            continue
-        needle = _normalize(keyword)
-        if len(needle) < 3:
-            continue
-
-        pattern = re.escape(needle)
-        for match in re.finditer(pattern, normalized_text):
-            idx = match.start()
-            segment_start = max(0, idx - window)
-            segment_end = min(len(full_text), idx + len(needle) + window)
-            if not _overlaps(segment_start, segment_end, used_spans):
-                segments.append((segment_start, full_text[segment_start:segment_end].strip()))
-                used_spans.append((segment_start, segment_end))
+    needles = sorted(keywords, key=lambda needle: (-len(needle), needle))
+    index.prefetch(needles)
+    span_starts, span_ends = _select_spans(index, needles, window, len(full_text), max_chars)
 
     # Fallback: take the first max_chars chunk
-    if not segments:
+    if not span_starts:
         return full_text[:max_chars]
 
-    compact = _join_segments(segments, max_chars)
+    compact = _join_segments(full_text, span_starts, span_ends, max_chars)
     if compact:
         return compact
     return full_text[:max_chars]
 
 
-def _collect_keywords(schema: Dict[str, str], learned_patterns: Dict[str, Dict[str, str]]) -> Iterable[str]:
-    keywords: set[str] = set()
+def _select_spans(
+    index: ContextIndex, needles: Iterable[str], window: int, text_len: int, budget: int
+) -> Tuple[List[int], List[int]]:
+    """Return sorted ``(starts, ends)`` of the windows kept around keyword hits.
+
+    Windows are taken greedily in keyword order and dropped when they overlap
+    one already kept. Kept windows are disjoint, so their ends are sorted as
+    well and one bisect both rules out overlaps and gives the insertion slot.
+    Selection stops once the kept windows (plus separators) fill ``budget``.
+    """
+
+    starts: List[int] = []
+    ends: List[int] = []
+    insert_start = starts.insert
+    insert_end = ends.insert
+    selected = 0
+    for needle in needles:
+        reach = len(needle) + window
+        for idx in index.positions(needle):
+            segment_start = idx - window if idx > window else 0
+            segment_end = idx + reach
+            if segment_end > text_len:
+                segment_end = text_len
+            if segment_start >= segment_end:
+                # Normalization can shift offsets past the raw text; such windows are empty
+                continue
+            slot = bisect_left(starts, segment_end)
+            if slot and ends[slot - 1] > segment_start:
+                continue
+            insert_start(slot, segment_start)
+            insert_end(slot, segment_end)
+            selected += segment_end - segment_start + 2
+            if selected >= budget:
+                return starts, ends
+    return starts, ends
+
+
+def _find_all(text: str, needle: str) -> Iterator[int]:
+    """Yield non-overlapping offsets of a literal ``needle``, like ``re.finditer``."""
+
+    step = len(needle) or 1
+    find = text.find
+    idx = find(needle)
+    while idx >= 0:
+        yield idx
+        idx = find(needle, idx + step)
+
+
+@lru_cache(maxsize=128)
+def _keyword_automaton(needles: FrozenSet[str]):
+    automaton = ahocorasick.Automaton()
+    for needle in needles:
+        automaton.add_word(needle, needle)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=128)
+def _keyword_regex(needles: FrozenSet[str]) -> re.Pattern[str]:
+    # Zero-width lookahead so every offset is tried; longest-first picks the longest hit
+    alternation = "|".join(map(re.escape, sorted(needles, key=len, reverse=True)))
+    return re.compile(f"(?=({alternation}))")
+
+
+def _collect_keywords(schema: Dict[str, str], learned_patterns: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    """Map each normalized keyword to the first token that produced it.
+
+    Tokens that differ only in case or accents collapse into one needle, so
+    the document is searched for each form once.
+    """
+
+    keywords: Dict[str, str] = {}
 
     for field_name, description in schema.items():
-        keywords.update(_tokenize(field_name))
-        keywords.update(_tokenize(description))
+        tokens = [*_tokenize(field_name), *_tokenize(description)]
 
         example = (learned_patterns.get(field_name) or {}).get("example")
         if example:
-            keywords.update(_tokenize(example))
+            tokens.extend(_tokenize(example))
+
+        # Tokens are ASCII alphanumerics, for which _normalize is just lower():
+        # lower them all with one call on the joined string
+        needles = "\0".join(tokens).lower().split("\0") if tokens else []
+        for needle, token in zip(needles, tokens):
+            if needle not in keywords:
+                keywords[needle] = token
 
     return keywords
 
 
 def _tokenize(text: str) -> Iterable[str]:
-    for token in re.split(r"[^A-Za-z0-9]+", text or ""):
-        token = token.strip()
+    # Split tokens are runs of [A-Za-z0-9], so there is nothing to strip
+    for token in _TOKEN_RE.split(text or ""):
         if len(token) >= 3:
             yield token
 
 
-def _overlaps(start: int, end: int, spans: List[tuple[int, int]]) -> bool:
-    for span_start, span_end in spans:
-        if max(span_start, start) < min(span_end, end):
-            return True
-    return False
+def _join_segments(full_text: str, span_starts: List[int], span_ends: List[int], max_chars: int) -> str:
+    """Slice the sorted spans out of ``full_text`` once, in document order, within ``max_chars``."""
 
-
-def _join_segments(segments: List[Tuple[int, str]], max_chars: int) -> str:
     compact_parts: List[str] = []
     current_size = 0
+    separator_size = len("\n\n")
 
-    for _, segment in sorted(segments, key=lambda item: item[0]):
-        segment = segment.strip()
+    for start, end in zip(span_starts, span_ends):
+        segment = full_text[start:end].strip()
         if not segment:
             continue
-        addition = segment if current_size == 0 else f"\n\n{segment}"
-        if current_size + len(addition) > max_chars:
+        addition = len(segment) + separator_size if compact_parts else len(segment)
+        if current_size + addition > max_chars:
             continue
         compact_parts.append(segment)
-        current_size += len(addition)
+        current_size += addition
+        if max_chars - current_size <= separator_size:
+            break  # not even a one-character segment fits after another separator
 
-    if not compact_parts:
-        return ""
     return "\n\n".join(compact_parts)
 
 
+class _CombiningMarkTable(dict):
+    """``str.translate`` table that drops combining marks.
+
+    ``preload`` ranges are resolved up front; any other code point is filled
+    the first time it is seen, so ``translate`` calls back into Python at most
+    once per distinct character.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, preload: Iterable[range] = ()) -> None:
+        super().__init__()
+        for codepoints in preload:
+            for codepoint in codepoints:
+                self.__missing__(codepoint)
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        mapped = None if unicodedata.combining(chr(codepoint)) else codepoint
+        self[codepoint] = mapped
+        return mapped
+
+
+# Latin letters and punctuation, plus the combining blocks NFKD leaves after
+# them (diacritics, extended and supplementary marks, symbols, half marks)
+_STRIP_COMBINING = _CombiningMarkTable(
+    preload=(
+        range(0x0000, 0x0250),
+        range(0x0300, 0x0370),
+        range(0x1AB0, 0x1B00),
+        range(0x1DC0, 0x1E00),
+        range(0x2000, 0x2070),
+        range(0x20D0, 0x2100),
+        range(0xFE20, 0xFE30),
+    )
+)
+
+
 def _normalize(text: str) -> str:
-    normalized = unicodedata.normalize("NFKD", text or "")
-    return "".join(ch for ch in normalized if not unicodedata.combining(ch)).lower()
+    text = text or ""
+    if text.isascii():
+        # NFKD leaves ASCII untouched and it has no combining marks
+        return text.lower()
+    if not unicodedata.is_normalized("NFKD", text):
+        # The quick check spares a full-size copy when PDFium already emitted NFKD text
+        text = unicodedata.normalize("NFKD", text)
+    return text.translate(_STRIP_COMBINING).lower()
+
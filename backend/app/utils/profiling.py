@@ -2,28 +2,42 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from contextlib import contextmanager
-from time import perf_counter
+from time import perf_counter_ns
 from typing import Dict
 
+_NS_PER_MS = 1_000_000
+
 
 class ProfileCollector:
-    """Collects execution timings (in milliseconds) for named sections."""
+    """Collects execution timings for named sections, reported in milliseconds.
+
+    ``track`` is meant for coarse phases. Per-item timings inside hot loops
+    should be guarded by ``enabled`` and recorded with ``add`` so production
+    runs skip both the clock reads and the context-manager dispatch.
+    Timings accumulate as integer nanoseconds and are only converted to
+    milliseconds by ``snapshot``.
+    """
 
-    def __init__(self) -> None:
-        self._metrics = defaultdict(float)
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._metrics: Dict[str, int] = {}
 
     @contextmanager
     def track(self, name: str):
         """Context manager to time a code block."""
 
-        start = perf_counter()
+        start = perf_counter_ns()
         try:
             yield
         finally:
-            duration_ms = (perf_counter() - start) * 1000.0
-            self._metrics[name] += duration_ms
+            metrics = self._metrics
+            metrics[name] = metrics.get(name, 0) + (perf_counter_ns() - start)
+
+    def add(self, name: str, elapsed_ns: int) -> None:
+        """Accumulate a ``perf_counter_ns`` delta captured by the caller."""
+
+        self._metrics[name] = self._metrics.get(name, 0) + elapsed_ns
 
     def record(self, name: str, duration_ms: float | int) -> None:
         """Record an explicit duration."""
@@ -31,12 +45,12 @@ class ProfileCollector:
         if duration_ms is None:
             return
         try:
-            value = float(duration_ms)
+            value = int(float(duration_ms) * _NS_PER_MS)
         except (TypeError, ValueError):
             return
-        self._metrics[name] += value
+        self._metrics[name] = self._metrics.get(name, 0) + value
 
     def snapshot(self) -> Dict[str, int]:
-        """Return timings rounded to millisecond integers."""
+        """Return timings rounded down to millisecond integers."""
 
-        return {key: int(value) for key, value in self._metrics.items()}
+        return {key: value // _NS_PER_MS for key, value in self._metrics.items()}
@@ -6,9 +6,11 @@ import asyncio
 import json
 import logging
 import os
+import shutil
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
@@ -23,7 +25,22 @@ logging.basicConfig(
 )
 LOGGER = logging.getLogger(__name__)
 
-app = FastAPI(title="Enter AI Extraction API", version="0.1.0")
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Uploads up to this size are parsed straight from memory; larger ones are
+# streamed to a temporary file so they are never fully buffered
+_IN_MEMORY_UPLOAD_LIMIT = 32 * 1024 * 1024
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Release the extraction service's resources when the app shuts down."""
+
+    yield
+    # Joins the disk-cache writer so scheduled writes are not lost on shutdown
+    await asyncio.to_thread(service.close)
+
+
+app = FastAPI(title="Enter AI Extraction API", version="0.1.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,13 +54,9 @@ service = ExtractionService()
 
 def _write_temp_pdf(upload: UploadFile) -> Path:
     suffix = Path(upload.filename or "uploaded.pdf").suffix or ".pdf"
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    try:
-        contents = upload.file.read()
-        temp_file.write(contents)
-        temp_file.flush()
-    finally:
-        temp_file.close()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        # Stream in chunks so large uploads are never held in memory at once
+        shutil.copyfileobj(upload.file, temp_file, length=_UPLOAD_CHUNK_SIZE)
     LOGGER.debug("Temporary PDF stored at %s", temp_file.name)
     return Path(temp_file.name)
 
@@ -63,8 +76,11 @@ async def extract(
 
     temp_pdf_path: Path | None = None
     try:
-        temp_pdf_path = _write_temp_pdf(pdf_file)
-        request = ExtractionRequest(label=label, schema=schema, pdf_path=str(temp_pdf_path))
+        if pdf_file.size is not None and pdf_file.size <= _IN_MEMORY_UPLOAD_LIMIT:
+            request = ExtractionRequest(label=label, schema=schema, pdf_bytes=await pdf_file.read())
+        else:
+            temp_pdf_path = await asyncio.to_thread(_write_temp_pdf, pdf_file)
+            request = ExtractionRequest(label=label, schema=schema, pdf_path=str(temp_pdf_path))
         result = await service.extract(request)
         return JSONResponse(content=result.model_dump(by_alias=True, mode='json'))
     finally:
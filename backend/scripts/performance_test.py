@@ -3,6 +3,7 @@
 import asyncio
 import json
 import time
+from functools import lru_cache
 from pathlib import Path
 
 import aiohttp
@@ -11,6 +12,14 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 DATASET_PATH = BASE_DIR / "docs" / "data" / "dataset.json"
 FILES_DIR = BASE_DIR / "docs" / "files"
 API_URL = "http://localhost:8001/extract"
+MAX_CONNECTIONS = 10
+
+
+@lru_cache(maxsize=None)
+def load_pdf(pdf_path: Path) -> bytes:
+    """Read each PDF once; repeated requests reuse the same bytes."""
+    with open(pdf_path, "rb") as pdf_file:
+        return pdf_file.read()
 
 
 async def single_extraction(session: aiohttp.ClientSession, item: dict) -> dict:
@@ -29,7 +38,7 @@ async def single_extraction(session: aiohttp.ClientSession, item: dict) -> dict:
     data.add_field("extraction_schema", json.dumps(item["extraction_schema"]))
     data.add_field(
         "pdf_file",
-        open(pdf_path, "rb"),
+        load_pdf(pdf_path),
         filename=item["pdf_path"],
         content_type="application/pdf",
     )
@@ -63,7 +72,7 @@ async def single_extraction(session: aiohttp.ClientSession, item: dict) -> dict:
         }
 
 
-async def run_sequential():
+async def run_sequential(session: aiohttp.ClientSession):
     """Test sequential processing."""
     print("\n=== Sequential Processing Test ===")
 
@@ -73,18 +82,17 @@ async def run_sequential():
     # Limit to first 5 items for testing
     test_items = dataset[:5]
 
-    async with aiohttp.ClientSession() as session:
-        total_start = time.perf_counter()
-        results = []
+    total_start = time.perf_counter()
+    results = []
 
-        for item in test_items:
-            result = await single_extraction(session, item)
-            results.append(result)
-            print(
-                f"  {result['pdf']}: {result['duration']:.2f}s ({result['status']})"
-            )
+    for item in test_items:
+        result = await single_extraction(session, item)
+        results.append(result)
+        print(
+            f"  {result['pdf']}: {result['duration']:.2f}s ({result['status']})"
+        )
 
-        total_duration = time.perf_counter() - total_start
+    total_duration = time.perf_counter() - total_start
 
     print(f"\nTotal time: {total_duration:.2f}s")
     print(f"Average per PDF: {total_duration / len(test_items):.2f}s")
@@ -92,7 +100,7 @@ async def run_sequential():
     return results, total_duration
 
 
-async def run_parallel():
+async def run_parallel(session: aiohttp.ClientSession):
     """Test parallel processing."""
     print("\n=== Parallel Processing Test ===")
 
@@ -102,14 +110,13 @@ async def run_parallel():
     # Limit to first 5 items for testing
     test_items = dataset[:5]
 
-    async with aiohttp.ClientSession() as session:
-        total_start = time.perf_counter()
+    total_start = time.perf_counter()
 
-        # Launch all requests in parallel
-        tasks = [single_extraction(session, item) for item in test_items]
-        results = await asyncio.gather(*tasks)
+    # Launch all requests in parallel
+    tasks = [single_extraction(session, item) for item in test_items]
+    results = await asyncio.gather(*tasks)
 
-        total_duration = time.perf_counter() - total_start
+    total_duration = time.perf_counter() - total_start
 
     for result in results:
         print(f"  {result['pdf']}: {result['duration']:.2f}s ({result['status']})")
@@ -121,7 +128,7 @@ async def run_parallel():
     return results, total_duration
 
 
-async def run_cache_performance():
+async def run_cache_performance(session: aiohttp.ClientSession):
     """Test cache performance with same PDF."""
     print("\n=== Cache Performance Test ===")
 
@@ -130,20 +137,19 @@ async def run_cache_performance():
 
     test_item = dataset[0]
 
-    async with aiohttp.ClientSession() as session:
-        # First call (no cache)
-        print("First call (cold):")
-        result1 = await single_extraction(session, test_item)
-        print(f"  Duration: {result1['duration']:.2f}s")
-
-        # Second call (should hit cache)
-        print("\nSecond call (cached):")
-        result2 = await single_extraction(session, test_item)
-        print(f"  Duration: {result2['duration']:.2f}s")
-        print(f"  Speedup: {result1['duration'] / result2['duration']:.2f}x")
-        print(
-            f"  Source: {result2.get('metadata', {}).get('source', 'unknown')}"
-        )
+    # First call (no cache)
+    print("First call (cold):")
+    result1 = await single_extraction(session, test_item)
+    print(f"  Duration: {result1['duration']:.2f}s")
+
+    # Second call (should hit cache)
+    print("\nSecond call (cached):")
+    result2 = await single_extraction(session, test_item)
+    print(f"  Duration: {result2['duration']:.2f}s")
+    print(f"  Speedup: {result1['duration'] / result2['duration']:.2f}x")
+    print(
+        f"  Source: {result2.get('metadata', {}).get('source', 'unknown')}"
+    )
 
 
 async def main():
@@ -151,14 +157,17 @@ async def main():
     print("Performance Testing for Enter AI Extraction API")
     print("=" * 50)
 
-    # Test cache
-    await run_cache_performance()
+    # One keep-alive session for every run, so timings exclude connection setup
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Test cache
+        await run_cache_performance(session)
 
-    # Test sequential
-    seq_results, seq_time = await run_sequential()
+        # Test sequential
+        seq_results, seq_time = await run_sequential(session)
 
-    # Test parallel
-    par_results, par_time = await run_parallel()
+        # Test parallel
+        par_results, par_time = await run_parallel(session)
 
     # Summary
     print("\n" + "=" * 50)
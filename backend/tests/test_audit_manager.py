@@ -0,0 +1,182 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+AUDIT_PATH = Path(__file__).resolve().parents[2] / "docs" / "SISTEMA_AUDITORIA_BACKEND.py"
+
+
+def _load_audit_module():
+    spec = importlib.util.spec_from_file_location("sistema_auditoria_backend", AUDIT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+audit = _load_audit_module()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable ``time.monotonic`` for the audit module."""
+
+    now = [1000.0]
+    monkeypatch.setattr(audit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _log(manager, field_name, strategy="heuristic", value="x", time_ms=1.0, cost=0.0):
+    manager.log_event(field_name, strategy, "regex", 0.9, value=value, time_ms=time_ms, cost=cost)
+
+
+def _stored(manager):
+    return [(event.field_name, event.hit_count) for event in manager.events]
+
+
+def test_duplicates_within_window_are_merged(clock):
+    manager = audit.AuditManager("r", dedup_window=1.0)
+    _log(manager, "nome", time_ms=2.0, cost=0.5)
+    clock[0] += 0.5
+    _log(manager, "nome", time_ms=3.0, cost=0.25)
+
+    assert _stored(manager) == [("nome", 2)]
+    assert manager.events[0].time_ms == 5.0
+    assert manager.events[0].cost == 0.75
+    assert manager.generate_decision_log_json()[0]["hit_count"] == 2
+
+
+def test_duplicates_after_window_are_stored_again(clock):
+    manager = audit.AuditManager("r", dedup_window=1.0)
+    _log(manager, "nome")
+    clock[0] += 1.0
+    _log(manager, "nome")
+
+    assert _stored(manager) == [("nome", 1), ("nome", 1)]
+
+
+def test_different_values_are_not_merged(clock):
+    manager = audit.AuditManager("r")
+    _log(manager, "nome", value="a")
+    _log(manager, "nome", value="b")
+
+    assert _stored(manager) == [("nome", 1), ("nome", 1)]
+
+
+def test_llm_events_are_never_merged(clock):
+    manager = audit.AuditManager("r")
+    _log(manager, "telefone", strategy="llm")
+    _log(manager, "telefone", strategy=audit.StrategyType.LLM)
+
+    assert _stored(manager) == [("telefone", 1), ("telefone", 1)]
+    assert manager.llm_call_count == 2
+
+
+def test_dedup_keys_are_lru_capped(clock, monkeypatch):
+    monkeypatch.setattr(audit, "DEDUP_MAX_KEYS", 2)
+    manager = audit.AuditManager("r")
+    _log(manager, "a")
+    _log(manager, "b")
+    _log(manager, "a")  # refreshes "a", so "b" is the least recently used key
+    _log(manager, "c")
+    _log(manager, "b")
+
+    assert len(manager._dedup) == 2
+    assert _stored(manager) == [("a", 2), ("b", 1), ("c", 1), ("b", 1)]
+
+
+def test_drop_newest_does_not_merge_into_unstored_events(clock):
+    manager = audit.AuditManager("r", max_events=1, overflow=audit.OverflowPolicy.DROP_NEWEST)
+    _log(manager, "f1")
+    for _ in range(5):
+        _log(manager, "f2")
+
+    assert _stored(manager) == [("f1", 1)]
+    assert manager.dropped_events == 5
+    assert manager.generate_summary().startswith("Extração de 6 campos")
+
+
+def test_drop_oldest_forgets_dedup_key_of_evicted_event(clock):
+    manager = audit.AuditManager("r", max_events=1, overflow=audit.OverflowPolicy.DROP_OLDEST)
+    _log(manager, "f1")
+    _log(manager, "f2")
+    _log(manager, "f1")
+
+    assert _stored(manager) == [("f1", 1)]
+    assert list(manager._dedup) == [("f1", "heuristic", "regex", repr("x"))]
+    assert manager._dedup[("f1", "heuristic", "regex", repr("x"))] is manager.events[0]
+
+
+def test_verbose_lines_are_flushed_on_context_exit(capsys):
+    with audit.AuditManager("r", verbose=True) as manager:
+        _log(manager, "nome")
+        assert capsys.readouterr().out == "[AUDIT] Iniciado request r\n"
+
+    assert capsys.readouterr().out == "[AUDIT] nome: heuristic/regex (conf=90%)\n"
+
+
+def test_generate_audit_trail_flushes_verbose_lines(capsys):
+    manager = audit.AuditManager("r", verbose=True)
+    _log(manager, "nome")
+    capsys.readouterr()
+
+    manager.generate_audit_trail()
+    assert capsys.readouterr().out == "[AUDIT] nome: heuristic/regex (conf=90%)\n"
+
+
+def test_decision_log_entries_are_dicts(clock):
+    manager = audit.AuditManager("r")
+    _log(manager, "nome", value=["a"])
+
+    decision = manager.generate_audit_trail()["decision_log"][0]
+    assert isinstance(decision, dict)
+    assert decision["field"] == "nome"
+    assert decision["value"] == "['a']"
+    assert decision == manager.generate_decision_log_json()[0]
+
+
+def test_audit_trail_is_json_serializable(clock):
+    manager = audit.AuditManager("r")
+    _log(manager, "nome", value={"a": 1})
+    _log(manager, "telefone", strategy="llm", value=None, cost=0.001)
+
+    decoded = json.loads(json.dumps(manager.generate_audit_trail()))
+    assert [decision["field"] for decision in decoded["decision_log"]] == ["nome", "telefone"]
+    assert decoded == json.loads(json.dumps(manager.to_dict()))
+
+
+def test_audit_trail_is_unaffected_by_later_evictions(clock):
+    manager = audit.AuditManager("r", max_events=2, overflow=audit.OverflowPolicy.DROP_OLDEST)
+    _log(manager, "f1")
+    _log(manager, "f2")
+    decision_log = manager.generate_audit_trail()["decision_log"]
+    _log(manager, "f3")
+
+    assert [decision["field"] for decision in decision_log] == ["f1", "f2"]
+
+
+def test_mutating_a_returned_trail_does_not_leak(clock):
+    manager = audit.AuditManager("r")
+    _log(manager, "nome")
+    trail = manager.generate_audit_trail()
+    trail["summary"] = "changed"
+    trail["decision_log"].clear()
+    trail["audit_notes"].append("extra")
+
+    again = manager.generate_audit_trail()
+    assert again["summary"] != "changed"
+    assert len(again["decision_log"]) == 1
+    assert "extra" not in again["audit_notes"]
+    assert len(manager.to_dict()["decision_log"]) == 1
+
+
+def test_performance_note_tracks_elapsed_time(clock, monkeypatch):
+    wall = [0.0]
+    monkeypatch.setattr(audit.time, "time", lambda: wall[0])
+    manager = audit.AuditManager("r")
+    _log(manager, "nome")
+
+    assert manager.generate_audit_trail()["audit_notes"][-1].endswith("0ms")
+    wall[0] = 12.0
+    assert manager.generate_audit_trail()["audit_notes"][-1] == "⚠️ Performance lenta: 12.0s (acima de 10s)"
+    assert manager.to_dict()["audit_notes"] == manager.generate_audit_notes()
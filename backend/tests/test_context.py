@@ -0,0 +1,28 @@
+import re
+
+import pytest
+
+from app.utils import ContextIndex
+from app.utils import context
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_prefetch_matches_finditer_positions(monkeypatch, use_automaton):
+    if not use_automaton:
+        monkeypatch.setattr(context, "ahocorasick", None)
+    elif context.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+
+    text = "Banana ananas AAAA - inscrição 101943"
+    needles = ["ana", "anan", "aa", "a", "inscricao", "zz"]
+    index = ContextIndex(text)
+    index.prefetch(needles)
+
+    normalized = index.normalized_text
+    for needle in needles:
+        assert index.positions(needle) == tuple(m.start() for m in re.finditer(re.escape(needle), normalized))
+
+
+def test_normalized_text_matches_ascii_and_accented_forms():
+    assert ContextIndex("Inscricao SECCIONAL").normalized_text == "inscricao seccional"
+    assert ContextIndex("Inscrição Seccional ﬁm").normalized_text == "inscricao seccional fim"
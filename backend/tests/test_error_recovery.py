@@ -1,6 +1,6 @@
 import pytest
 
-from app.extractors.error_recovery import extract_with_recovery
+from app.extractors.error_recovery import extract_with_recovery, recover_fields
 from app.extractors.heuristics import HeuristicExtractor
 from app.extractors.validator import Validator
 from app.schema import SchemaLearner
@@ -11,6 +11,23 @@ class NullLLMExtractor:
         return {}, {}
 
 
+class FailingLLMExtractor:
+    async def extract_fields(self, *args, **kwargs):
+        raise RuntimeError("LLM unavailable")
+
+
+class CountingLLMExtractor:
+    def __init__(self):
+        self.schemas = []
+        self.validation_schemas = []
+
+    async def extract_fields(self, text, label, schema, tables=None, validation_schema=None):
+        self.schemas.append(schema)
+        self.validation_schemas.append(validation_schema)
+        # Raw values differ from normalized ones so tests can tell which was used
+        return {field: (f" valor-{field} ", f"valor-{field}", True) for field in schema}, {"total_tokens": 10}
+
+
 @pytest.mark.asyncio
 async def test_error_recovery_uses_template_pattern():
     text = "Código localizado: ABC-5678\nOutro dado."
@@ -41,3 +58,40 @@ async def test_error_recovery_uses_template_pattern():
     assert value == "ABC-5678"
     assert source == "template"
     assert metadata == {}
+
+
+@pytest.mark.asyncio
+async def test_recover_fields_batches_llm_fallback_into_one_call():
+    llm = CountingLLMExtractor()
+
+    results, metadata = await recover_fields(
+        fields={"apelido": "Apelido", "cargo": "Cargo"},
+        text="Documento sem os campos pedidos.",
+        label="documento",
+        heuristic_extractor=HeuristicExtractor(),
+        validator=Validator(),
+        llm_extractor=llm,
+        schema_learner=SchemaLearner(),
+    )
+
+    assert len(llm.schemas) == 1
+    assert set(llm.schemas[0]) == {"apelido", "cargo"}
+    assert llm.validation_schemas == [{"apelido": "Apelido", "cargo": "Cargo"}]
+    assert results == {"apelido": ("valor-apelido", "llm_retry"), "cargo": ("valor-cargo", "llm_retry")}
+    assert metadata == {"total_tokens": 10}
+
+
+@pytest.mark.asyncio
+async def test_recover_fields_keeps_local_values_when_llm_call_fails():
+    results, metadata = await recover_fields(
+        fields={"cpf": "CPF do titular", "apelido": "Apelido"},
+        text="Dados do titular\nCPF: 123.456.789-09\n",
+        label="documento",
+        heuristic_extractor=HeuristicExtractor(),
+        validator=Validator(),
+        llm_extractor=FailingLLMExtractor(),
+        schema_learner=SchemaLearner(),
+    )
+
+    assert results == {"cpf": ("123.456.789-09", "heuristic_retry"), "apelido": (None, "not_found")}
+    assert metadata == {}
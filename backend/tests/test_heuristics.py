@@ -0,0 +1,32 @@
+from app.extractors.heuristics import HeuristicContext, HeuristicExtractor
+
+SAMPLE_TEXT = (
+    "JOANA D'ARC\n"
+    "CPF: 123.456.789-09\n"
+    "Inscrição 01310300\n"
+    "Telefone 11 98765-4321\n"
+)
+
+
+def test_extract_by_field_name_uses_matching_pattern():
+    assert HeuristicExtractor.extract_by_field_name("cpf", SAMPLE_TEXT) == "123.456.789-09"
+    assert HeuristicExtractor.extract_by_field_name("telefone_profissional", SAMPLE_TEXT) == "11 98765-4321"
+
+
+def test_scan_all_keeps_overlapping_pattern_matches():
+    matches = HeuristicExtractor.scan_all(SAMPLE_TEXT)
+    assert matches["cep"] == ("01310300",)
+    assert "01310300" in matches["numero_documento"]
+
+
+def test_context_scans_document_once(monkeypatch):
+    from app.extractors import heuristics
+
+    scanned = []
+    real_scan = heuristics._scan_text
+    monkeypatch.setattr(heuristics, "_scan_text", lambda text: scanned.append(text) or real_scan(text))
+
+    context = HeuristicContext(SAMPLE_TEXT)
+    assert HeuristicExtractor.extract_by_field_name("cpf", context) == "123.456.789-09"
+    assert HeuristicExtractor.extract_by_description("Telefone de contato", context) == "11 98765-4321"
+    assert scanned == [SAMPLE_TEXT]
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.cache import MemoryCache, TieredCache
+from app.cache.memory_cache import hash_pdf_bytes, hash_pdf_file, result_cache_key, schema_fingerprint
+
+
+def test_cached_payload_is_isolated_snapshot():
+    cache = MemoryCache()
+    payload = {"label": "doc", "flat": {"nome": "Ana"}}
+    cache.set_pdf_result("key", payload)
+    payload["flat"]["nome"] = "changed"
+
+    cached = cache.get_pdf_result("key")
+    assert cached["flat"]["nome"] == "Ana"
+
+    cached["flat"]["nome"] = "Bia"
+    assert cache.get_pdf_result("key")["flat"]["nome"] == "Ana"
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = MemoryCache(max_entries=2)
+    cache.set_pdf_result("a", {"value": 1})
+    cache.set_pdf_result("b", {"value": 2})
+    cache.get_pdf_result("a")
+    cache.set_pdf_result("c", {"value": 3})
+
+    assert cache.get_pdf_result("b") is None
+    assert cache.get_pdf_result("a") is not None
+    assert cache.get_pdf_result("c") is not None
+
+    stats = cache.stats()["results"]
+    assert stats["evictions"] == 1
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+
+
+def test_byte_budget_bounds_pdf_content_store():
+    cache = MemoryCache(max_bytes=4096)
+    for index in range(10):
+        cache.set_pdf_content(f"hash-{index}", "x" * 1000, [("a", "b")])
+
+    stats = cache.stats()["pdf_content"]
+    assert stats["bytes"] <= 4096
+    assert stats["evictions"] > 0
+    assert cache.get_pdf_content("hash-9") is not None
+
+
+def test_tiered_cache_reloads_from_disk(tmp_path):
+    cache = TieredCache(str(tmp_path))
+    cache.set_pdf_result("key", {"flat": {"nome": "Ana"}})
+    cache.set_pdf_content("hash", "texto", [("a", "b")])
+    cache.close()
+
+    reopened = TieredCache(str(tmp_path))
+    assert reopened.get_pdf_result("key")["flat"]["nome"] == "Ana"
+    assert reopened.get_pdf_content("hash") == ("texto", (("a", "b"),))
+    assert reopened.stats()["results"]["entries"] == 1
+    reopened.close()
+
+
+def test_tiered_cache_counts_disk_hits_separately(tmp_path):
+    cache = TieredCache(str(tmp_path))
+    cache.set_pdf_content("hash", "texto", [("a", "b")])
+    cache.close()
+
+    reopened = TieredCache(str(tmp_path))
+    assert reopened.get_pdf_content("hash") == ("texto", (("a", "b"),))
+    assert reopened.get_pdf_content("hash") == ("texto", (("a", "b"),))
+    assert reopened.get_pdf_content("missing") is None
+
+    stats = reopened.stats()
+    assert stats["pdf_content"]["hits"] == 1
+    assert stats["pdf_content"]["misses"] == 2
+    assert stats["disk"]["hits"] == 1
+    assert stats["disk"]["misses"] == 1
+    reopened.close()
+
+
+def test_result_cache_key_matches_for_bytes_and_streamed_file(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 sample")
+
+    from_bytes = result_cache_key("oab", hash_pdf_bytes(pdf_path.read_bytes()), schema_fingerprint(["b", "a"]))
+    from_file = result_cache_key("oab", hash_pdf_file(str(pdf_path)), schema_fingerprint(["a", "b"]))
+    assert from_bytes == from_file == f"oab:{hash_pdf_file(str(pdf_path))}:a|b"
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_async_reads_fall_back_to_disk_off_loop(tmp_path, monkeypatch):
+    cache = TieredCache(str(tmp_path))
+    cache.set_pdf_result("key", {"flat": {"nome": "Ana"}})
+    cache.set_pdf_content("hash", "texto", [("a", "b")])
+    cache.close()
+
+    reopened = TieredCache(str(tmp_path))
+    offloaded = []
+    real_to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args):
+        offloaded.append(args)
+        return await real_to_thread(func, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+    assert (await reopened.get_pdf_result_async("key"))["flat"]["nome"] == "Ana"
+    assert await reopened.get_pdf_content_async("hash") == ("texto", (("a", "b"),))
+    assert await reopened.get_pdf_result_async("missing") is None
+    # Promoted entries are served from RAM without another thread hop
+    assert await reopened.get_pdf_result_async("key") is not None
+
+    assert offloaded == [("result:key",), ("content:hash",), ("result:missing",)]
+    assert reopened.stats()["disk"]["hits"] == 2
+    assert reopened.stats()["disk"]["misses"] == 1
+    reopened.close()
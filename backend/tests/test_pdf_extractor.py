@@ -16,3 +16,15 @@ def test_extract_tables_returns_list():
     pdf_path = FIXTURE_DIR / "oab_1.pdf"
     tables = PDFExtractor.extract_tables(str(pdf_path))
     assert isinstance(tables, list)
+
+
+def test_extract_all_matches_individual_passes():
+    pdf_path = str(FIXTURE_DIR / "oab_1.pdf")
+    text, tables = PDFExtractor.extract_all(pdf_path)
+    assert text == PDFExtractor.extract_text(pdf_path)
+    assert tables == PDFExtractor.extract_tables(pdf_path)
+
+
+def test_extract_all_accepts_pdf_bytes():
+    pdf_path = FIXTURE_DIR / "oab_1.pdf"
+    assert PDFExtractor.extract_all(pdf_path.read_bytes()) == PDFExtractor.extract_all(str(pdf_path))
@@ -0,0 +1,16 @@
+from app.schema.patterns import SchemaLearner
+
+
+def test_learning_stops_once_label_cap_is_reached(monkeypatch):
+    monkeypatch.setattr(SchemaLearner, "MAX_LABELS", 2)
+    learner = SchemaLearner()
+    learner.learn_from_result("a", {"nome": "Nome"}, {"nome": "Ana"}, {"nome": "heuristic"})
+    learner.learn_from_result("b", {"nome": "Nome"}, {"nome": "Bia"}, {"nome": "llm"})
+    learner.learn_from_result("c", {"nome": "Nome"}, {"nome": "Caio"}, {"nome": "llm"})
+    learner.learn_from_result("a", {"cpf": "CPF"}, {"cpf": "123"}, {"cpf": "heuristic"})
+
+    assert set(learner.learned) == {"a", "b"}
+    assert learner.get_patterns("a") == {
+        "nome": {"last_source": "heuristic", "example": "Ana", "description": "Nome"},
+    }
+    assert learner.suggest_source_for_field("a", "cpf") == "unknown"
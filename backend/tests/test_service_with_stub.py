@@ -1,9 +1,14 @@
+import asyncio
+import gc
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 from unittest.mock import patch
 
 import pytest
 
+from app.cache import TieredCache
+from app.extractors import Validator
 from app.models import ExtractionRequest
 from app.services.extraction import ExtractionService
 
@@ -14,9 +19,36 @@ class StubLLMExtractor:
     """Fake extractor returning deterministic data for tests."""
 
     async def extract_fields(
-        self, text: str, label: str, schema: Dict[str, str], tables: Any = None
-    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-        return {field: f"fake-{field}" for field in schema}, {"model": "stub"}
+        self,
+        text: str,
+        label: str,
+        schema: Dict[str, str],
+        tables: Any = None,
+        validation_schema: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Dict[str, Tuple[Any, Any, bool]], Dict[str, Any]]:
+        outcomes = {}
+        for field, description in schema.items():
+            is_valid, normalized = Validator.validate_field(field, f"fake-{field}", description)
+            outcomes[field] = (f"fake-{field}", normalized, is_valid)
+        return outcomes, {"model": "stub"}
+
+
+@contextmanager
+def stub_settings():
+    """Patch settings so ExtractionService can be built without OPENAI_API_KEY."""
+
+    with patch("app.services.extraction.get_settings") as mock_settings:
+        mock_settings.return_value.extraction_max_chars = 6000
+        mock_settings.return_value.openai_api_key = "test-key"
+        mock_settings.return_value.openai_model = "gpt-5-mini"
+        mock_settings.return_value.temperature = 1.0
+        mock_settings.return_value.cache_max_entries = 256
+        mock_settings.return_value.cache_max_bytes = 64 * 1024 * 1024
+        mock_settings.return_value.cache_dir = None
+        mock_settings.return_value.pdf_parallel_workers = 1
+        mock_settings.return_value.use_pdfplumber_text = False
+        mock_settings.return_value.detailed_profiling = False
+        yield mock_settings
 
 
 @pytest.mark.asyncio
@@ -28,13 +60,7 @@ async def test_service_returns_expected_structure():
         pdf_path=str(pdf_path),
     )
 
-    # Mock settings to avoid needing OPENAI_API_KEY in tests
-    with patch("app.services.extraction.get_settings") as mock_settings:
-        mock_settings.return_value.extraction_max_chars = 6000
-        mock_settings.return_value.openai_api_key = "test-key"
-        mock_settings.return_value.openai_model = "gpt-5-mini"
-        mock_settings.return_value.temperature = 1.0
-
+    with stub_settings():
         service = ExtractionService(llm_extractor=StubLLMExtractor())
         result = await service.extract(request)
 
@@ -45,3 +71,163 @@ async def test_service_returns_expected_structure():
         assert result.metadata.profiling is not None
         assert "total_ms" in result.metadata.profiling
         assert result.flat["nome"] == "fake-nome"
+
+
+def test_default_llm_extractor_uses_service_validator():
+    validator = Validator()
+    with stub_settings():
+        service = ExtractionService(validator=validator)
+
+    assert service.llm_extractor.validator is validator
+
+
+class GatedLLMExtractor:
+    """Counts calls and holds every call until ``release`` is set."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def extract_fields(self, text, label, schema, tables=None, validation_schema=None):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {field: ("v", "v", True) for field in schema}, {"model": "stub"}
+
+
+def _coalescing_service(llm: GatedLLMExtractor) -> ExtractionService:
+    with stub_settings():
+        return ExtractionService(llm_extractor=llm)
+
+
+@pytest.mark.asyncio
+async def test_identical_llm_prompts_share_one_call():
+    llm = GatedLLMExtractor()
+    service = _coalescing_service(llm)
+    first = asyncio.ensure_future(service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None))
+    second = asyncio.ensure_future(service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None))
+    await asyncio.sleep(0)
+    llm.release.set()
+
+    assert await first == await second
+    assert llm.calls == 1
+    assert service._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_different_labels_or_schemas_do_not_share_a_call():
+    llm = GatedLLMExtractor()
+    service = _coalescing_service(llm)
+    calls = [
+        service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None),
+        service._extract_fields_coalesced("texto", "tela", {"nome": "Nome"}, None),
+        service._extract_fields_coalesced("texto", "oab", {"nome": "Nome completo"}, None),
+    ]
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0)
+    llm.release.set()
+    await asyncio.gather(*tasks)
+
+    assert llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_awaiter_leaves_shared_call_running():
+    llm = GatedLLMExtractor()
+    service = _coalescing_service(llm)
+    cancelled = asyncio.ensure_future(service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None))
+    survivor = asyncio.ensure_future(service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    llm.release.set()
+
+    fields, _ = await survivor
+    assert fields == {"nome": ("v", "v", True)}
+    assert cancelled.cancelled()
+    assert llm.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_shared_call_is_released_and_raised_to_every_awaiter():
+    llm = GatedLLMExtractor(error=RuntimeError("boom"))
+    service = _coalescing_service(llm)
+    tasks = [
+        asyncio.ensure_future(service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    llm.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert service._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_failure_after_every_awaiter_cancelled_is_not_reported_unretrieved():
+    loop = asyncio.get_running_loop()
+    reported = []
+    loop.set_exception_handler(lambda _, context: reported.append(context))
+    try:
+        llm = GatedLLMExtractor(error=RuntimeError("boom"))
+        service = _coalescing_service(llm)
+        awaiter = asyncio.ensure_future(service._extract_fields_coalesced("texto", "oab", {"nome": "Nome"}, None))
+        await asyncio.sleep(0)
+        shared = next(iter(service._inflight.values()))
+        awaiter.cancel()
+        await asyncio.sleep(0)
+        llm.release.set()
+        while not shared.done():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # The cancelled awaiter's traceback still references the shared task
+        del shared, awaiter
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert service._inflight == {}
+    assert reported == []
+
+
+@pytest.mark.asyncio
+async def test_result_cache_hits_are_isolated_copies():
+    request = ExtractionRequest(
+        label="carteira_oab",
+        schema={"nome": "Nome"},
+        pdf_path=str(FIXTURE_DIR / "oab_1.pdf"),
+    )
+    with stub_settings():
+        service = ExtractionService(llm_extractor=StubLLMExtractor())
+        first = await service.extract(request)
+        hit = await service.extract(request)
+
+        assert first.metadata.source != "cache"
+        assert hit.metadata.source == "cache"
+        assert hit.flat == first.flat
+
+        hit.results[0].value = "mutated"
+        hit.flat["nome"] = "mutated"
+        hit.metadata.model = "mutated"
+        again = await service.extract(request)
+
+    assert again.metadata.source == "cache"
+    assert again.results[0].value == "fake-nome"
+    assert again.flat["nome"] == "fake-nome"
+    assert again.metadata.model == "stub"
+
+
+def test_close_flushes_disk_cache_writes(tmp_path):
+    with stub_settings() as mock_settings:
+        mock_settings.return_value.cache_dir = str(tmp_path)
+        service = ExtractionService(llm_extractor=StubLLMExtractor())
+    assert isinstance(service.cache, TieredCache)
+    service.cache.set_pdf_result("key", {"flat": {"nome": "Ana"}})
+    service.close()
+
+    reopened = TieredCache(str(tmp_path))
+    assert reopened.get_pdf_result("key") == {"flat": {"nome": "Ana"}}
+    reopened.close()
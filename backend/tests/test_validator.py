@@ -0,0 +1,19 @@
+from app.extractors import Validator
+
+
+def test_validate_many_matches_validate_field():
+    items = [
+        ("cpf", "123.456.789-09", ""),
+        ("cpf_conjuge", "12345678909", ""),
+        ("cpf_titular", "111.111.111-11", ""),
+        ("email", " ana@example.com ", ""),
+        ("telefone", "abc", ""),
+        ("categoria", "Suplementar", "Pode ser: principal, suplementar"),
+        ("nome", None, ""),
+        ("nome_social", "  ", ""),
+        ("nome", "JOANA", ""),
+    ]
+
+    expected = [Validator.validate_field(name, value, description) for name, value, description in items]
+    assert Validator.validate_many(items) == expected
+    assert expected[1] == (True, "123.456.789-09")
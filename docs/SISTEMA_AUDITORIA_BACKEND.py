@@ -4,13 +4,32 @@ Sistema de auditoria inteligente e automática
 Rastreia cada decisão do backend e gera relatórios
 """
 
+import io
+import sys
 import time
 import json
+from collections import OrderedDict, deque
+from collections.abc import Sequence
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+try:  # Encoder em C, opcional; sem ele cai no json da biblioteca padrão
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Eventos verbose acumulados antes de uma escrita única em stdout
+VERBOSE_FLUSH_EVERY = 64
+
+# Chaves lembradas para deduplicação de eventos repetidos (LRU)
+DEDUP_MAX_KEYS = 4096
+
+# Eventos guardados por padrão no log de decisões
+MAX_EVENTS = 10_000
+
 
 class StrategyType(str, Enum):
     """Tipos de estratégia de extração"""
@@ -22,24 +41,54 @@ class StrategyType(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+class OverflowPolicy(str, Enum):
+    """O que fazer quando o log de eventos atinge max_events"""
+    DROP_OLDEST = "drop_oldest"  # mantém os eventos mais recentes
+    DROP_NEWEST = "drop_newest"  # mantém os primeiros eventos registrados
+
+
+# IDs inteiros por estratégia, na ordem de StrategyType; estratégias fora do
+# enum compartilham _OTHER_ID. Os contadores são listas indexadas por ID
+_STRATEGY_ID: Dict[str, int] = {member.value: index for index, member in enumerate(StrategyType)}
+_CACHE_ID = _STRATEGY_ID[StrategyType.CACHE.value]
+_HEURISTIC_ID = _STRATEGY_ID[StrategyType.HEURISTIC.value]
+_LLM_ID = _STRATEGY_ID[StrategyType.LLM.value]
+_NULL_ID = _STRATEGY_ID[StrategyType.NULL.value]
+_OTHER_ID = len(_STRATEGY_ID)
+
+# Etapas fixas do fim do fluxo, já unidas pelo separador
+_FLOW_SEPARATOR = " → "
+_FLOW_TAIL = _FLOW_SEPARATOR.join(("validation(50ms)", "audit_logging(20ms)"))
+
+# Tupla vazia compartilhada: eventos sem alternativas não alocam lista própria
+_EMPTY: tuple = ()
+
+
+@dataclass(slots=True)
 class AuditEvent:
-    """Evento auditável individual"""
+    """Evento auditável individual (slots: sem __dict__ por instância)"""
     field_name: str
-    strategy: str  # StrategyType
+    strategy: str  # valor (internado) de StrategyType
     substrategy: str  # "regex_pattern", "semantic_extraction", etc
     confidence: float  # 0.0-1.0
     value: Any
     time_ms: float
     cost: float = 0.0
     description: str = ""
-    alternatives_tried: List[str] = field(default_factory=list)
+    alternatives_tried: Sequence[str] = _EMPTY
     llm_reasoning: str = ""
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.monotonic)  # ver AuditManager.event_datetime
+    hit_count: int = 1  # ocorrências idênticas agregadas neste evento
+    strategy_id: int = _OTHER_ID  # ver _STRATEGY_ID
+
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
 
 
 class FieldDecisionLog(dict):
     """Log de decisão estruturado (dict com campos)"""
+    __slots__ = ()
+
     def __init__(
         self,
         field: str,
@@ -47,11 +96,12 @@ class FieldDecisionLog(dict):
         substrategy: str,
         confidence: float,
         description: str,
-        alternatives_tried: List[str] = None,
+        alternatives_tried: Optional[Sequence[str]] = None,
         cost: float = 0.0,
         time_ms: float = 0.0,
         llm_reasoning: Optional[str] = None,
-        value: Optional[Any] = None
+        value: Optional[Any] = None,
+        hit_count: int = 1
     ):
         super().__init__()
         self['field'] = field
@@ -59,13 +109,63 @@ class FieldDecisionLog(dict):
         self['substrategy'] = substrategy
         self['confidence'] = confidence
         self['description'] = description
-        self['alternatives_tried'] = alternatives_tried or []
+        self['alternatives_tried'] = alternatives_tried or _EMPTY
         self['cost'] = cost
         self['time_ms'] = time_ms
         if llm_reasoning:
             self['llm_reasoning'] = llm_reasoning
         if value is not None:
-            self['value'] = str(value) if not isinstance(value, (str, int, float, bool, type(None))) else value
+            self['value'] = str(value) if not isinstance(value, _JSON_SCALARS) else value
+        if hit_count > 1:
+            self['hit_count'] = hit_count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Cópia como dict simples"""
+        return dict(self)
+
+
+def _decision_from_event(event: AuditEvent) -> FieldDecisionLog:
+    return FieldDecisionLog(
+        field=event.field_name,
+        strategy=event.strategy,
+        substrategy=event.substrategy,
+        confidence=event.confidence,
+        description=event.description,
+        alternatives_tried=event.alternatives_tried,
+        cost=event.cost,
+        time_ms=event.time_ms,
+        llm_reasoning=event.llm_reasoning if event.llm_reasoning else None,
+        value=event.value,
+        hit_count=event.hit_count
+    )
+
+
+def _decision_json_from_event(event: AuditEvent) -> Dict[str, Any]:
+    """Mesmo resultado de _decision_from_event(event).to_dict(), sem o objeto intermediário"""
+    value = event.value
+    if not isinstance(value, _JSON_SCALARS):
+        value = str(value)
+    data = {
+        'field': event.field_name,
+        'strategy': event.strategy,
+        'substrategy': event.substrategy,
+        'confidence': event.confidence,
+        'description': event.description,
+        'alternatives_tried': event.alternatives_tried if event.alternatives_tried else _EMPTY,
+        'cost': event.cost,
+        'time_ms': event.time_ms,
+    }
+    if event.llm_reasoning:
+        data['llm_reasoning'] = event.llm_reasoning
+    if value is not None:
+        data['value'] = value
+    if event.hit_count > 1:
+        data['hit_count'] = event.hit_count
+    return data
+
+
+def _dedup_key(field_name: str, strategy: str, substrategy: str, value: Any) -> tuple:
+    return (field_name, strategy, substrategy, repr(value))
 
 
 class AuditTrail(dict):
@@ -73,7 +173,7 @@ class AuditTrail(dict):
     def __init__(
         self,
         summary: str,
-        decision_log: List[FieldDecisionLog],
+        decision_log: List[Dict[str, Any]],
         process_flow: str,
         efficiency_score: float,
         audit_notes: List[str]
@@ -86,25 +186,69 @@ class AuditTrail(dict):
         self['audit_notes'] = audit_notes
 
 
+def dumps_json(data: Any) -> str:
+    """Serializa com indentação de 2 espaços, preservando acentos (orjson se disponível)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
 class AuditManager:
     """Gerenciador central de auditoria"""
     
-    def __init__(self, request_id: str = None, verbose: bool = False):
+    def __init__(
+        self,
+        request_id: str = None,
+        verbose: bool = False,
+        dedup_window: float = 1.0,
+        max_events: Optional[int] = MAX_EVENTS,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ):
         """
         Inicializa audit manager
         
         Args:
             request_id: ID único do request para rastreamento
-            verbose: Log eventos em tempo real
+            verbose: Log eventos em tempo real (em lotes de VERBOSE_FLUSH_EVERY
+                linhas; generate_audit_trail(), flush_verbose() ou a saída de
+                um bloco ``with`` escrevem as pendentes)
+            dedup_window: Segundos em que um evento idêntico (campo, estratégia,
+                sub-estratégia e valor) é somado ao anterior em vez de
+                registrado de novo; 0 desativa a deduplicação
+            max_events: Limite de eventos guardados (None = sem limite); as
+                estatísticas do relatório continuam cobrindo todos os eventos
+            overflow: Política ao atingir o limite (OverflowPolicy)
         """
-        self.request_id = request_id or f"req_{datetime.now().timestamp()}"
-        self.events: List[AuditEvent] = []
+        # Relógio de parede lido uma vez; eventos guardam só time.monotonic()
+        self.start_wall = datetime.now()
+        self.start_mono = time.monotonic()
+        self.request_id = request_id or f"req_{self.start_wall.timestamp()}"
+        self.max_events = max_events
+        self.overflow = OverflowPolicy(overflow)
+        if max_events is not None and self.overflow is OverflowPolicy.DROP_OLDEST:
+            # deque com maxlen descarta o mais antigo em O(1) a cada append
+            self.events: Sequence[AuditEvent] = deque(maxlen=max_events)
+        else:
+            self.events = []
+        self._total_logged = 0
         self.start_time = time.time()
         self.llm_call_count = 0
         self.total_cost = 0.0
         self.cache_hit = False
         self.pdf_extract_time = 0.0
         self.verbose = verbose
+        self.dedup_window = dedup_window
+        self._dedup: "OrderedDict[tuple, AuditEvent]" = OrderedDict()
+        # Estatísticas acumuladas por log_event: os relatórios não varrem self.events
+        self._count_by_strategy: List[int] = [0] * (_OTHER_ID + 1)
+        self._time_by_strategy: List[float] = [0.0] * (_OTHER_ID + 1)
+        self._conf_sum = 0.0
+        self._null_fields: List[str] = []
+        # Último relatório gerado (sem a nota de performance); log_event o invalida
+        self._trail_cache: Optional[Dict[str, Any]] = None
+        self._trail_cache_key: Optional[tuple] = None
+        self._verbose_buf = io.StringIO()
+        self._verbose_count = 0
         
         if self.verbose:
             print(f"[AUDIT] Iniciado request {self.request_id}")
@@ -119,7 +263,7 @@ class AuditManager:
         time_ms: float = 0.0,
         cost: float = 0.0,
         description: str = "",
-        alternatives_tried: List[str] = None,
+        alternatives_tried: Sequence[str] = _EMPTY,
         llm_reasoning: str = ""
     ):
         """
@@ -137,40 +281,140 @@ class AuditManager:
             alternatives_tried: Estratégias tentadas antes
             llm_reasoning: Raciocínio do LLM (se aplicável)
         """
+        # Membro do enum ou string: ambos viram a mesma string internada
+        strategy_key = sys.intern(strategy.value if isinstance(strategy, StrategyType) else strategy)
+        strategy_id = _STRATEGY_ID.get(strategy_key, _OTHER_ID)
+        self._trail_cache = None
+        now = time.monotonic()
+        self.total_cost += cost
+        self._time_by_strategy[strategy_id] += time_ms
+        
+        key = None
+        if strategy_id == _LLM_ID:
+            # Cada chamada LLM é única: nunca deduplicada
+            self.llm_call_count += 1
+        elif self.dedup_window > 0:
+            key = _dedup_key(field_name, strategy_key, substrategy, value)
+            existing = self._dedup.get(key)
+            if existing is not None and now - existing.timestamp < self.dedup_window:
+                existing.hit_count += 1
+                existing.time_ms += time_ms
+                existing.cost += cost
+                self._dedup.move_to_end(key)
+                self._log_verbose(field_name, strategy, substrategy, confidence)
+                return
+        
         event = AuditEvent(
             field_name=field_name,
-            strategy=strategy,
+            strategy=strategy_key,
             substrategy=substrategy,
             confidence=confidence,
             value=value,
             time_ms=time_ms,
             cost=cost,
             description=description,
-            alternatives_tried=alternatives_tried or [],
-            llm_reasoning=llm_reasoning
+            alternatives_tried=alternatives_tried if alternatives_tried else _EMPTY,
+            llm_reasoning=llm_reasoning,
+            strategy_id=strategy_id,
+            timestamp=now
         )
-        
-        self.events.append(event)
-        self.total_cost += cost
-        
-        if strategy == StrategyType.LLM or strategy == "llm":
-            self.llm_call_count += 1
-        
+        stored = self._store_event(event)
+        self._total_logged += 1
+        self._count_by_strategy[strategy_id] += 1
+        self._conf_sum += confidence
+        if strategy_id == _NULL_ID:
+            self._null_fields.append(field_name)
+        
+        # Só eventos guardados recebem duplicatas; os demais contam apenas nos agregados
+        if key is not None and stored:
+            self._dedup[key] = event
+            self._dedup.move_to_end(key)
+            if len(self._dedup) > DEDUP_MAX_KEYS:
+                self._dedup.popitem(last=False)
+        
+        self._log_verbose(field_name, strategy, substrategy, confidence)
+    
+    def _store_event(self, event: AuditEvent) -> bool:
+        """Guarda o evento conforme max_events/overflow; retorna se ele foi guardado"""
+        events = self.events
+        if self.max_events is None:
+            events.append(event)
+            return True
+        if len(events) < self.max_events:
+            events.append(event)
+            return True
+        if self.overflow is OverflowPolicy.DROP_NEWEST:
+            return False
+        if not events:  # max_events == 0: nada é guardado
+            return False
+        # DROP_OLDEST: o deque descarta events[0]; a deduplicação o esquece também
+        evicted = events[0]
+        evicted_key = _dedup_key(evicted.field_name, evicted.strategy, evicted.substrategy, evicted.value)
+        if self._dedup.get(evicted_key) is evicted:
+            del self._dedup[evicted_key]
+        events.append(event)
+        return True
+    
+    def _log_verbose(self, field_name: str, strategy: str, substrategy: str, confidence: float):
         if self.verbose:
-            print(f"[AUDIT] {field_name}: {strategy}/{substrategy} (conf={confidence:.0%})")
+            self._verbose_buf.write(f"[AUDIT] {field_name}: {strategy}/{substrategy} (conf={confidence:.0%})\n")
+            self._verbose_count += 1
+            if self._verbose_count >= VERBOSE_FLUSH_EVERY:
+                self.flush_verbose()
+    
+    def flush_verbose(self):
+        """Escreve de uma vez as linhas verbose pendentes em stdout"""
+        if not self._verbose_count:
+            return
+        sys.stdout.write(self._verbose_buf.getvalue())
+        sys.stdout.flush()
+        self._verbose_buf = io.StringIO()
+        self._verbose_count = 0
+    
+    def __enter__(self) -> "AuditManager":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Linhas pendentes não se perdem se o relatório nunca for gerado
+        self.flush_verbose()
+    
+    def _report_stats(self) -> Dict[str, Any]:
+        """
+        Intermediários compartilhados por sumário, fluxo, score e notas
+        
+        Lidos dos contadores de log_event; _build_report calcula uma vez e
+        repassa a todos os geradores.
+        """
+        by_strategy = self._count_by_strategy
+        total_fields = self._total_logged
+        heuristic_fields = by_strategy[_HEURISTIC_ID]
+        cache_fields = by_strategy[_CACHE_ID]
+        return {
+            'total_fields': total_fields,
+            'heuristic_fields': heuristic_fields,
+            'llm_fields': by_strategy[_LLM_ID],
+            'cache_fields': cache_fields,
+            'null_fields': by_strategy[_NULL_ID],
+            # Fração de campos resolvidos sem LLM (heurística/cache)
+            'efficient_share': (heuristic_fields + cache_fields) / total_fields if total_fields > 0 else 0,
+            'avg_confidence': self._conf_sum / total_fields if total_fields > 0 else 0,
+        }
     
     def generate_summary(self) -> str:
         """Gera sumário em linguagem natural português"""
-        if not self.events:
+        return self._summary(self._report_stats())
+    
+    def _summary(self, stats: Dict[str, Any]) -> str:
+        total_fields = stats['total_fields']
+        if not total_fields:
             return "Nenhum evento registrado"
         
-        total_fields = len(self.events)
-        heuristic_fields = sum(1 for e in self.events if e.strategy == StrategyType.HEURISTIC)
-        llm_fields = sum(1 for e in self.events if e.strategy == StrategyType.LLM)
-        cache_fields = sum(1 for e in self.events if e.strategy == StrategyType.CACHE)
-        null_fields = sum(1 for e in self.events if e.strategy == StrategyType.NULL)
+        heuristic_fields = stats['heuristic_fields']
+        llm_fields = stats['llm_fields']
+        cache_fields = stats['cache_fields']
+        null_fields = stats['null_fields']
         
-        avg_confidence = sum(e.confidence for e in self.events) / total_fields if total_fields > 0 else 0
+        avg_confidence = stats['avg_confidence']
         
         summary = f"Extração de {total_fields} campos com "
         parts = []
@@ -202,98 +446,78 @@ class AuditManager:
         
         return summary
     
+    @property
+    def dropped_events(self) -> int:
+        """Eventos que não couberam no log por causa de max_events"""
+        return self._total_logged - len(self.events)
+    
     def generate_decision_log(self) -> List[FieldDecisionLog]:
         """Gera log de decisões estruturado"""
-        return [
-            FieldDecisionLog(
-                field=event.field_name,
-                strategy=event.strategy,
-                substrategy=event.substrategy,
-                confidence=event.confidence,
-                description=event.description,
-                alternatives_tried=event.alternatives_tried,
-                cost=event.cost,
-                time_ms=event.time_ms,
-                llm_reasoning=event.llm_reasoning if event.llm_reasoning else None,
-                value=event.value
-            )
-            for event in self.events
-        ]
+        return [_decision_from_event(event) for event in self.events]
+    
+    def generate_decision_log_json(self) -> List[Dict[str, Any]]:
+        """Log de decisões já como dicts serializáveis (sem criar FieldDecisionLog)"""
+        return [_decision_json_from_event(event) for event in self.events]
     
     def generate_process_flow(self) -> str:
         """Descreve o fluxo de processamento em ASCII"""
-        flow_steps = []
-        
+        return self._process_flow(self._report_stats())
+    
+    def _process_flow(self, stats: Dict[str, Any]) -> str:
         # Cache status
-        if self.cache_hit:
-            flow_steps.append("cache_hit")
-        else:
-            flow_steps.append("cache_miss")
+        flow_steps = ["cache_hit" if self.cache_hit else "cache_miss"]
         
         # PDF extraction
         if self.pdf_extract_time > 0:
             flow_steps.append(f"pdf_extract({self.pdf_extract_time:.0f}ms)")
         
-        # Agrupar estratégias por tipo
-        has_heuristics = any(e.strategy == StrategyType.HEURISTIC for e in self.events)
-        has_llm = any(e.strategy == StrategyType.LLM for e in self.events)
+        # Tempos por estratégia já somados em log_event; a contagem decide se a
+        # etapa aparece, mesmo quando o tempo total é zero
+        time_by_strategy = self._time_by_strategy
         
-        if has_heuristics:
-            heuristic_time = sum(
-                e.time_ms for e in self.events 
-                if e.strategy == StrategyType.HEURISTIC
-            )
-            flow_steps.append(f"heuristics({heuristic_time:.0f}ms)")
+        if stats['heuristic_fields']:
+            flow_steps.append(f"heuristics({time_by_strategy[_HEURISTIC_ID]:.0f}ms)")
         
-        if has_llm:
-            llm_time = sum(
-                e.time_ms for e in self.events 
-                if e.strategy == StrategyType.LLM
-            )
-            flow_steps.append(f"llm_batch_{self.llm_call_count}_call({llm_time:.0f}ms)")
+        if stats['llm_fields']:
+            flow_steps.append(f"llm_batch_{self.llm_call_count}_call({time_by_strategy[_LLM_ID]:.0f}ms)")
         
         # Validação e logging
-        flow_steps.append("validation(50ms)")
-        flow_steps.append("audit_logging(20ms)")
+        flow_steps.append(_FLOW_TAIL)
         
-        return " → ".join(flow_steps)
+        return _FLOW_SEPARATOR.join(flow_steps)
     
     def calculate_efficiency_score(self) -> float:
         """
         Calcula score de eficiência (0.0-1.0)
         Baseado em: % resolvido sem LLM + confiança
         """
-        if not self.events:
+        return self._efficiency_score(self._report_stats())
+    
+    def _efficiency_score(self, stats: Dict[str, Any]) -> float:
+        if not stats['total_fields']:
             return 0.0
         
-        total_fields = len(self.events)
-        efficient_fields = sum(
-            1 for e in self.events 
-            if e.strategy in [StrategyType.HEURISTIC, StrategyType.CACHE]
-        )
-        
         # Score base: percentual de campos via heurística/cache
-        efficiency = efficient_fields / total_fields
+        efficiency = stats['efficient_share']
         
         # Bônus se alta confiança
-        avg_confidence = sum(e.confidence for e in self.events) / total_fields
-        if avg_confidence > 0.85:
+        if stats['avg_confidence'] > 0.85:
             efficiency = min(1.0, efficiency * 1.05)
         
         return efficiency
     
     def generate_audit_notes(self) -> List[str]:
         """Gera observações estruturadas com análise"""
+        return self._with_performance_note(self._audit_notes(self._report_stats()))
+    
+    def _audit_notes(self, stats: Dict[str, Any]) -> List[str]:
         notes = []
         
-        if not self.events:
+        if not stats['total_fields']:
             return ["ℹ️ Nenhum evento para analisar"]
         
         # === ANÁLISE DE COBERTURA ===
-        total_fields = len(self.events)
-        heuristic_fields = sum(1 for e in self.events if e.strategy == StrategyType.HEURISTIC)
-        cache_fields = sum(1 for e in self.events if e.strategy == StrategyType.CACHE)
-        efficient_pct = (heuristic_fields + cache_fields) / total_fields * 100
+        efficient_pct = stats['efficient_share'] * 100
         
         if efficient_pct >= 80:
             notes.append(f"✅ Alta cobertura: {efficient_pct:.1f}% campos via heurísticas/cache (baixo custo)")
@@ -303,7 +527,7 @@ class AuditManager:
             notes.append(f"⚠️ Cobertura baixa: {efficient_pct:.1f}% campos via heurísticas (mais LLM necessário)")
         
         # === ANÁLISE DE LLM ===
-        llm_fields = sum(1 for e in self.events if e.strategy == StrategyType.LLM)
+        llm_fields = stats['llm_fields']
         
         if self.llm_call_count > 0:
             notes.append(f"✅ Uso estratégico de LLM: {self.llm_call_count} call(s) para {llm_fields} campo(s)")
@@ -311,7 +535,7 @@ class AuditManager:
             notes.append("✅ Zero chamadas LLM (heurísticas/cache apenas)")
         
         # === ANÁLISE DE CONFIANÇA ===
-        avg_confidence = sum(e.confidence for e in self.events) / total_fields if total_fields > 0 else 0
+        avg_confidence = stats['avg_confidence']
         
         if avg_confidence > 0.85:
             notes.append(f"✅ Alta confiança: {avg_confidence:.0%} de confiança média")
@@ -321,40 +545,89 @@ class AuditManager:
             notes.append(f"❌ Confiança baixa: {avg_confidence:.0%} (revisão manual recomendada)")
         
         # === ANÁLISE DE CAMPOS NULOS ===
-        null_events = [e for e in self.events if e.strategy == StrategyType.NULL]
-        if null_events:
-            fields_list = ", ".join([f"'{e.field_name}'" for e in null_events])
+        null_fields = self._null_fields
+        if null_fields:
+            fields_list = ", ".join([f"'{name}'" for name in null_fields])
             notes.append(f"ℹ️ Campos nulos: {fields_list} vazios no documento")
         
+        # === ANÁLISE DE CAPACIDADE ===
+        dropped = self.dropped_events
+        if dropped > 0:
+            notes.append(
+                f"⚠️ Log de decisões limitado a {self.max_events} eventos: "
+                f"{dropped} descartado(s) ({self.overflow.value})"
+            )
+        
         # === ANÁLISE DE CUSTO ===
         if self.total_cost > 0:
             notes.append(f"💰 Custo de processamento: ${self.total_cost:.6f}")
         else:
             notes.append("💰 Sem custos: processamento via heurísticas/cache")
         
+        return notes
+    
+    def _with_performance_note(self, notes: List[str]) -> List[str]:
+        """
+        Nova lista com a nota de performance no fim
+        
+        Ela depende do tempo decorrido, então é calculada a cada chamada e
+        fica fora do relatório em cache.
+        """
+        if not self._total_logged:
+            return list(notes)
+        
         # === ANÁLISE DE PERFORMANCE ===
         elapsed = self.get_elapsed_time()
         if elapsed < 1:
-            notes.append(f"⚡ Performance ultra-rápida: {elapsed*1000:.0f}ms")
+            performance = f"⚡ Performance ultra-rápida: {elapsed*1000:.0f}ms"
         elif elapsed < 5:
-            notes.append(f"⚡ Performance rápida: {elapsed:.1f}s")
+            performance = f"⚡ Performance rápida: {elapsed:.1f}s"
         elif elapsed < 10:
-            notes.append(f"ℹ️ Performance aceitável: {elapsed:.1f}s")
+            performance = f"ℹ️ Performance aceitável: {elapsed:.1f}s"
         else:
-            notes.append(f"⚠️ Performance lenta: {elapsed:.1f}s (acima de 10s)")
-        
-        return notes
+            performance = f"⚠️ Performance lenta: {elapsed:.1f}s (acima de 10s)"
+        return [*notes, performance]
     
     def generate_audit_trail(self) -> AuditTrail:
-        """Gera auditoria completa"""
+        """
+        Gera auditoria completa
+        
+        O relatório é reaproveitado até o próximo log_event (ou mudança de
+        cache_hit/pdf_extract_time). Cada chamada devolve um AuditTrail novo,
+        com listas próprias e a nota de performance recalculada; os dicts do
+        log de decisões são compartilhados e não devem ser alterados.
+        """
+        self.flush_verbose()
+        key = (self.cache_hit, self.pdf_extract_time)
+        if self._trail_cache is None or self._trail_cache_key != key:
+            self._trail_cache = self._build_report()
+            self._trail_cache_key = key
+        report = self._trail_cache
         return AuditTrail(
-            summary=self.generate_summary(),
-            decision_log=self.generate_decision_log(),
-            process_flow=self.generate_process_flow(),
-            efficiency_score=self.calculate_efficiency_score(),
-            audit_notes=self.generate_audit_notes()
+            summary=report['summary'],
+            decision_log=list(report['decision_log']),
+            process_flow=report['process_flow'],
+            efficiency_score=report['efficiency_score'],
+            audit_notes=self._with_performance_note(report['audit_notes']),
         )
     
+    def _build_report(self) -> Dict[str, Any]:
+        """Monta todas as seções do relatório sobre um único conjunto de intermediários"""
+        stats = self._report_stats()
+        return {
+            'summary': self._summary(stats),
+            # Dicts simples direto dos eventos: o trail é serializável em JSON
+            # e não muda se eventos forem descartados depois
+            'decision_log': self.generate_decision_log_json(),
+            'process_flow': self._process_flow(stats),
+            'efficiency_score': self._efficiency_score(stats),
+            'audit_notes': self._audit_notes(stats),
+        }
+    
+    def event_datetime(self, event: AuditEvent) -> datetime:
+        """Converte o timestamp monotônico de um evento em data/hora local"""
+        return self.start_wall + timedelta(seconds=event.timestamp - self.start_mono)
+    
     def get_elapsed_time(self) -> float:
         """Retorna tempo total de processamento em segundos"""
         return time.time() - self.start_time
@@ -365,8 +638,16 @@ class AuditManager:
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte audit trail para dicionário (para JSON)"""
+        # Reaproveita o relatório em cache; o log de decisões ganha dicts
+        # próprios, direto dos eventos
         audit_trail = self.generate_audit_trail()
-        return dict(audit_trail)
+        return {
+            'summary': audit_trail['summary'],
+            'decision_log': self.generate_decision_log_json(),
+            'process_flow': audit_trail['process_flow'],
+            'efficiency_score': audit_trail['efficiency_score'],
+            'audit_notes': audit_trail['audit_notes'],
+        }
 
 
 # ============================================================================
@@ -414,35 +695,37 @@ if __name__ == "__main__":
         llm_reasoning="Campo marcado como 'Telefone Profissional' mas vazio no documento. Retornou null corretamente."
     )
     
-    # Gerar relatório
-    print("\n" + "="*80)
-    print("AUDITORIA GERADA")
-    print("="*80)
+    # Gerar relatório (montado em memória e escrito de uma vez no final)
+    audit.flush_verbose()
+    report = io.StringIO()
+    print("\n" + "="*80, file=report)
+    print("AUDITORIA GERADA", file=report)
+    print("="*80, file=report)
     
     audit_trail = audit.generate_audit_trail()
     
-    print(f"\n📋 SUMÁRIO:\n{audit_trail['summary']}")
-    print(f"\n⚙️ FLUXO DE PROCESSAMENTO:\n{audit_trail['process_flow']}")
-    print(f"\n📊 SCORE DE EFICIÊNCIA: {audit_trail['efficiency_score']:.0%}")
+    print(f"\n📋 SUMÁRIO:\n{audit_trail['summary']}", file=report)
+    print(f"\n⚙️ FLUXO DE PROCESSAMENTO:\n{audit_trail['process_flow']}", file=report)
+    print(f"\n📊 SCORE DE EFICIÊNCIA: {audit_trail['efficiency_score']:.0%}", file=report)
     
-    print("\n📝 LOG DE DECISÕES:")
+    print("\n📝 LOG DE DECISÕES:", file=report)
     for i, decision in enumerate(audit_trail['decision_log'], 1):
-        print(f"\n  {i}. Campo: {decision['field']}")
-        print(f"     Estratégia: {decision['strategy']} ({decision['substrategy']})")
-        print(f"     Confiança: {decision['confidence']:.0%}")
-        print(f"     Tempo: {decision['time_ms']}ms | Custo: ${decision['cost']:.6f}")
-        print(f"     Descrição: {decision['description']}")
+        print(f"\n  {i}. Campo: {decision['field']}", file=report)
+        print(f"     Estratégia: {decision['strategy']} ({decision['substrategy']})", file=report)
+        print(f"     Confiança: {decision['confidence']:.0%}", file=report)
+        print(f"     Tempo: {decision['time_ms']}ms | Custo: ${decision['cost']:.6f}", file=report)
+        print(f"     Descrição: {decision['description']}", file=report)
     
-    print("\n📋 OBSERVAÇÕES:")
+    print("\n📋 OBSERVAÇÕES:", file=report)
     for note in audit_trail['audit_notes']:
-        print(f"  {note}")
+        print(f"  {note}", file=report)
     
-    print(f"\n⏱️ Tempo total: {audit.get_elapsed_time():.2f}s")
-    print(f"💰 Custo estimado: {audit.get_cost_estimate()}")
+    print(f"\n⏱️ Tempo total: {audit.get_elapsed_time():.2f}s", file=report)
+    print(f"💰 Custo estimado: {audit.get_cost_estimate()}", file=report)
     
-    print("\n" + "="*80)
-    print("JSON COMPLETO (para resposta HTTP)")
-    print("="*80)
+    print("\n" + "="*80, file=report)
+    print("JSON COMPLETO (para resposta HTTP)", file=report)
+    print("="*80, file=report)
     
     response = {
         "label": "carteira_oab",
@@ -459,4 +742,5 @@ if __name__ == "__main__":
         "audit_trail": audit.to_dict()
     }
     
-    print(json.dumps(response, indent=2, ensure_ascii=False))
\ No newline at end of file
+    print(dumps_json(response), file=report)
+    sys.stdout.write(report.getvalue())